@@ -34,6 +34,22 @@ class Settings(BaseSettings):
     # Number of chunks to translate in parallel within a single chapter
     parallel_chunks: int = 3
 
+    # Save a chapter's partial translation after at least this many new chunks
+    persist_every_n_chunks: int = 4
+
+    # Number of chapters to translate in parallel during a full translation
+    parallel_chapters: int = 3
+
+    # Send full-book translations through the OpenAI Batch API (half price,
+    # results within 24h).  Only used for runs of at least
+    # batch_min_chapters chapters; other providers use normal requests.
+    use_batch_api: bool = False
+    batch_min_chapters: int = 20
+
+    # Worker processes for the name-rescan search across chapters;
+    # 1 scans in-process
+    name_scan_processes: int = 1
+
     # Max words to read for writing style analysis (only first N words are
     # summarized; background/terms/characters come from online research)
     analysis_max_words: int = 15000
@@ -4,7 +4,7 @@ import json
 import sqlite3
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 
 from .config import settings
 
@@ -136,6 +136,13 @@ _MIGRATIONS = [
         created_at TEXT NOT NULL
     )""",
     "ALTER TABLE strategies ADD COLUMN annotation_density TEXT DEFAULT 'normal'",
+    """CREATE TABLE IF NOT EXISTS chunk_cache (
+        chapter_id TEXT NOT NULL,
+        request_key TEXT NOT NULL,
+        response TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        PRIMARY KEY (chapter_id, request_key)
+    )""",
 ]
 
 
@@ -220,6 +227,8 @@ def delete_project(project_id: str) -> None:
         conn.execute("DELETE FROM translation_versions WHERE project_id=?", (project_id,))
         conn.execute("DELETE FROM strategy_versions WHERE project_id=?", (project_id,))
         conn.execute("DELETE FROM qa_history WHERE project_id=?", (project_id,))
+        conn.execute("DELETE FROM chunk_cache WHERE chapter_id IN "
+                     "(SELECT id FROM chapters WHERE project_id=?)", (project_id,))
         conn.execute("DELETE FROM chapters WHERE project_id=?", (project_id,))
         conn.execute("DELETE FROM analyses WHERE project_id=?", (project_id,))
         conn.execute("DELETE FROM strategies WHERE project_id=?", (project_id,))
@@ -250,12 +259,51 @@ def get_chapters(project_id: str) -> list[dict]:
     return [dict(r) for r in rows]
 
 
+def get_project_with_chapters(
+    project_id: str, fields: tuple[str, ...] | None = None,
+) -> tuple[dict | None, list[dict]]:
+    """Fetch a project and its chapters over one connection.
+
+    ``fields`` restricts the chapter columns selected so callers that only
+    need metadata do not load the large text columns."""
+    cols = ", ".join(fields) if fields else "*"
+    with _connect() as conn:
+        row = conn.execute("SELECT * FROM projects WHERE id=?", (project_id,)).fetchone()
+        rows = conn.execute(
+            f"SELECT {cols} FROM chapters WHERE project_id=? ORDER BY chapter_index",
+            (project_id,),
+        ).fetchall()
+    return (dict(row) if row else None), [dict(r) for r in rows]
+
+
+def iter_chapters(project_id: str, fields: tuple[str, ...] | None = None) -> Iterator[dict]:
+    """Yield a project's chapters one row at a time, in chapter order."""
+    cols = ", ".join(fields) if fields else "*"
+    with _connect() as conn:
+        cur = conn.execute(
+            f"SELECT {cols} FROM chapters WHERE project_id=? ORDER BY chapter_index",
+            (project_id,),
+        )
+        for row in cur:
+            yield dict(row)
+
+
 def get_chapter(chapter_id: str) -> dict | None:
     with _connect() as conn:
         row = conn.execute("SELECT * FROM chapters WHERE id=?", (chapter_id,)).fetchone()
     return dict(row) if row else None
 
 
+def get_chapter_status(chapter_id: str) -> tuple[str, bool] | None:
+    """Return (status, has_translation) without loading the chapter text."""
+    with _connect() as conn:
+        row = conn.execute(
+            "SELECT status, COALESCE(translated_content, '') != '' FROM chapters WHERE id=?",
+            (chapter_id,),
+        ).fetchone()
+    return (row[0], bool(row[1])) if row else None
+
+
 def update_chapter(chapter_id: str, **kwargs) -> None:
     sets = ", ".join(f"{k}=?" for k in kwargs)
     vals = list(kwargs.values()) + [chapter_id]
@@ -463,24 +511,58 @@ def get_strategy_version(project_id: str, version: int) -> dict | None:
 
 # ── Translation Version CRUD ────────────────────────────────────────────
 
+def _insert_translation_version(
+    conn: sqlite3.Connection, project_id: str, chapter_id: str, version: int,
+    translated_content: str, translated_title: str, annotations: str,
+    feedback: str, strategy_version: int, is_sample: bool,
+) -> int:
+    from datetime import datetime, timezone
+    now = datetime.now(timezone.utc).isoformat()
+    cur = conn.execute(
+        "INSERT INTO translation_versions "
+        "(project_id, chapter_id, version, translated_content, translated_title, "
+        "annotations, feedback, strategy_version, is_sample, created_at) "
+        "VALUES (?,?,?,?,?,?,?,?,?,?)",
+        (project_id, chapter_id, version, translated_content, translated_title,
+         annotations, feedback, strategy_version, 1 if is_sample else 0, now),
+    )
+    return cur.lastrowid
+
+
 def save_translation_version(
     project_id: str, chapter_id: str, version: int,
     translated_content: str, translated_title: str = "",
     annotations: str = "", feedback: str = "",
     strategy_version: int = 0, is_sample: bool = False,
 ) -> int:
-    from datetime import datetime, timezone
-    now = datetime.now(timezone.utc).isoformat()
     with _connect() as conn:
-        cur = conn.execute(
-            "INSERT INTO translation_versions "
-            "(project_id, chapter_id, version, translated_content, translated_title, "
-            "annotations, feedback, strategy_version, is_sample, created_at) "
-            "VALUES (?,?,?,?,?,?,?,?,?,?)",
-            (project_id, chapter_id, version, translated_content, translated_title,
-             annotations, feedback, strategy_version, 1 if is_sample else 0, now),
+        return _insert_translation_version(
+            conn, project_id, chapter_id, version, translated_content,
+            translated_title, annotations, feedback, strategy_version, is_sample)
+
+
+def save_chapter_translation(
+    project_id: str, chapter_id: str, version: int,
+    translated_content: str, translated_title: str = "",
+    annotations: str = "", feedback: str = "",
+    strategy_version: int = 0,
+) -> int:
+    """Mark a chapter translated and record the text as a new version.
+
+    The writes share one connection and one commit, so the chapter row and
+    its version history cannot disagree. The chapter's cached chunk
+    responses are dropped in the same commit."""
+    with _connect() as conn:
+        conn.execute(
+            "UPDATE chapters SET translated_content=?, status='translated', translated_title=?, "
+            "annotations=?, translation_version=?, strategy_version_used=? WHERE id=?",
+            (translated_content, translated_title, annotations, version,
+             strategy_version, chapter_id),
         )
-        return cur.lastrowid
+        conn.execute("DELETE FROM chunk_cache WHERE chapter_id=?", (chapter_id,))
+        return _insert_translation_version(
+            conn, project_id, chapter_id, version, translated_content,
+            translated_title, annotations, feedback, strategy_version, False)
 
 
 def get_translation_versions(project_id: str, chapter_id: str) -> list[dict]:
@@ -546,3 +628,27 @@ def get_strategy_template(template_id: str) -> dict | None:
 def delete_strategy_template(template_id: str) -> None:
     with _connect() as conn:
         conn.execute("DELETE FROM strategy_templates WHERE id=?", (template_id,))
+
+
+# ── Chunk Response Cache ────────────────────────────────────────────────
+# Responses for the chunks of a chapter still being translated, so a stopped
+# or failed chapter resumes without re-requesting finished chunks.
+
+def get_cached_chunk(chapter_id: str, request_key: str) -> str | None:
+    with _connect() as conn:
+        row = conn.execute(
+            "SELECT response FROM chunk_cache WHERE chapter_id=? AND request_key=?",
+            (chapter_id, request_key),
+        ).fetchone()
+    return row["response"] if row else None
+
+
+def save_cached_chunk(chapter_id: str, request_key: str, response: str) -> None:
+    from datetime import datetime, timezone
+    now = datetime.now(timezone.utc).isoformat()
+    with _connect() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO chunk_cache (chapter_id, request_key, response, created_at) "
+            "VALUES (?,?,?,?)",
+            (chapter_id, request_key, response, now),
+        )
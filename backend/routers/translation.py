@@ -423,17 +423,19 @@ async def _run_all(project_id: str, start_chapter: int = 0, end_chapter: int = -
 
 @router.get("/projects/{project_id}/progress", response_model=TranslationProgress)
 async def get_progress(project_id: str):
-    p = db.get_project(project_id)
+    # Polled by the UI while translating: only the status columns are needed
+    p, chapters = db.get_project_with_chapters(
+        project_id, fields=("chapter_index", "title", "status"))
     if not p:
         raise HTTPException(404, "Project not found")
-    chapters = db.get_chapters(project_id)
     translated = sum(1 for c in chapters if c["status"] == "translated")
     current = next((c["title"] for c in chapters if c["status"] == "translating"), None)
     current_idx = next((c["chapter_index"] for c in chapters if c["status"] == "translating"), None)
 
-    chunk_info = translation_service.get_chunk_progress(project_id)
-    chunk_done = chunk_info["chunk_done"] if chunk_info else 0
-    chunk_total = chunk_info["chunk_total"] if chunk_info else 0
+    chunk_info = (translation_service.get_chunk_progress(project_id, current_idx)
+                  if current_idx is not None else None)
+    chunk_done = chunk_info.chunk_done if chunk_info else 0
+    chunk_total = chunk_info.chunk_total if chunk_info else 0
 
     return TranslationProgress(
         project_id=project_id,
@@ -533,13 +535,7 @@ async def download_chapter_epub(project_id: str, chapter_id: str):
     ch = db.get_chapter(chapter_id)
     if not p or not ch or ch["project_id"] != project_id:
         raise HTTPException(404, "Chapter not found")
-    import re
-    from pathlib import Path
-    safe_name = re.sub(r'[<>:"/\\|?*]', '_', p["name"])[:80].strip()
-    out_dir = settings.output_dir / safe_name
-    idx = ch["chapter_index"] + 1
-    safe_title = re.sub(r'[<>:"/\\|?*]', '_', ch["title"])[:60].strip()
-    path = out_dir / f"Ch{idx:03d}_{safe_title}.epub"
+    path = translation_service.chapter_epub_path(p, ch)
     if not path.exists():
         raise HTTPException(404, "Chapter EPUB not found on disk")
     return FileResponse(
@@ -562,7 +558,7 @@ async def combine_chapters(
     p = db.get_project(project_id)
     if not p:
         raise HTTPException(404, "Project not found")
-    result = translation_service.combine_all_chapters(
+    result = await translation_service.combine_all_chapters(
         project_id,
         include_annotations=include_annotations,
         ann_placement=ann_placement,
@@ -597,7 +593,7 @@ async def download_annotations_epub(project_id: str):
     p = db.get_project(project_id)
     if not p:
         raise HTTPException(404, "Project not found")
-    result = translation_service.build_annotations_book(project_id)
+    result = await asyncio.to_thread(translation_service.build_annotations_book, project_id)
     if not result:
         raise HTTPException(400, "No annotations available")
     return FileResponse(
@@ -613,7 +609,7 @@ async def download_highlights(project_id: str, format: str = "epub"):
     if not p:
         raise HTTPException(404, "Project not found")
     if format == "md":
-        result = translation_service.build_highlights_markdown(project_id)
+        result = await asyncio.to_thread(translation_service.build_highlights_markdown, project_id)
         if not result:
             raise HTTPException(400, "No highlights or notes available")
         return FileResponse(
@@ -621,7 +617,7 @@ async def download_highlights(project_id: str, format: str = "epub"):
             media_type="text/markdown; charset=utf-8",
             filename=result.name,
         )
-    result = translation_service.build_highlights_book(project_id)
+    result = await asyncio.to_thread(translation_service.build_highlights_book, project_id)
     if not result:
         raise HTTPException(400, "No highlights or notes available")
     return FileResponse(
@@ -636,7 +632,7 @@ async def download_qa_epub(project_id: str):
     p = db.get_project(project_id)
     if not p:
         raise HTTPException(404, "Project not found")
-    result = translation_service.build_qa_book(project_id)
+    result = await asyncio.to_thread(translation_service.build_qa_book, project_id)
     if not result:
         raise HTTPException(400, "No Q&A history available")
     return FileResponse(
@@ -505,6 +505,11 @@ def _esc(text: str) -> str:
     return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
 
 
+_SEPARATOR_RE = re.compile(r'^[\s\*\-=~·•—]{3,}$')
+_CHAPTER_NUM_PREFIX_RE = re.compile(r'^(chapter|第)\s*\d+\s*[:：.、\s]*', re.IGNORECASE)
+_SUBHEADING_RE = re.compile(r'^(第.{1,6}[章节回部篇]|Chapter\s+\d|Part\s+\d|PART\s+\d|\d+\.)')
+
+
 def _text_to_html_body(text: str, chapter_title: str = "") -> str:
     """Convert translated plain text to structured HTML with proper headings."""
     lines = text.split("\n\n")
@@ -517,14 +522,14 @@ def _text_to_html_body(text: str, chapter_title: str = "") -> str:
             continue
 
         # Detect separators (lines of only *, -, =, ~ etc.)
-        if re.match(r'^[\s\*\-=~·•—]{3,}$', line):
+        if _SEPARATOR_RE.match(line):
             parts.append('<p class="separator">* * *</p>')
             continue
 
         # If the first paragraph matches or is very close to the chapter title, render as h1
         if not title_added:
-            cleaned = re.sub(r'^(chapter|第)\s*\d+\s*[:：.、\s]*', '', line, flags=re.IGNORECASE).strip()
-            cleaned_title = re.sub(r'^(chapter|第)\s*\d+\s*[:：.、\s]*', '', chapter_title, flags=re.IGNORECASE).strip()
+            cleaned = _CHAPTER_NUM_PREFIX_RE.sub('', line).strip()
+            cleaned_title = _CHAPTER_NUM_PREFIX_RE.sub('', chapter_title).strip()
             if (cleaned.lower() == cleaned_title.lower()
                     or line.strip().lower() == chapter_title.strip().lower()
                     or len(line) < 80 and _similarity(line, chapter_title) > 0.6):
@@ -537,7 +542,7 @@ def _text_to_html_body(text: str, chapter_title: str = "") -> str:
 
         # Short standalone lines that look like sub-headings
         if len(line) < 60 and not line.endswith(('。', '.', '！', '!', '？', '?', '」', '"', '…')):
-            if re.match(r'^(第.{1,6}[章节回部篇]|Chapter\s+\d|Part\s+\d|PART\s+\d|\d+\.)', line):
+            if _SUBHEADING_RE.match(line):
                 parts.append(f"<h2>{_esc(line)}</h2>")
                 continue
 
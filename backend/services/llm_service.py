@@ -1,12 +1,14 @@
 """Unified LLM client supporting Google GenAI (Gemini), OpenAI-compatible APIs, and Ollama."""
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
 import logging
 import os
 import re
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Callable, Optional
 
 from openai import AsyncOpenAI
 
@@ -24,6 +26,10 @@ class ChatResult:
 # Runtime-overridable settings (set via /api/settings endpoint)
 _runtime: dict = {}
 
+# Provider clients are reused so their connection pools keep connections
+# alive across calls; each slot holds (credentials key, client).
+_clients: dict[str, tuple[tuple, Any]] = {}
+
 
 def configure(provider: str, api_key: str, base_url: str, model: str,
               translation_model: str = "", temperature: float = 0.3) -> None:
@@ -66,17 +72,27 @@ def _temperature() -> float:
 
 # ── Gemini (native google-genai SDK) ────────────────────────────────────
 
+def _gemini_client():
+    from google import genai
+
+    api_key = _api_key()
+    cached = _clients.get("gemini")
+    if cached and cached[0] == (api_key,):
+        return cached[1]
+    client = genai.Client(api_key=api_key) if api_key else genai.Client()
+    _clients["gemini"] = ((api_key,), client)
+    return client
+
+
 async def _chat_gemini(
     system_prompt: str,
     user_prompt: str,
     for_translation: bool = False,
     max_tokens: Optional[int] = None,
 ) -> ChatResult:
-    from google import genai
     from google.genai import types
 
-    api_key = _api_key()
-    client = genai.Client(api_key=api_key) if api_key else genai.Client()
+    client = _gemini_client()
     model = _model(for_translation=for_translation)
     max_tok = max_tokens or (settings.llm_translation_max_tokens if for_translation else settings.llm_max_tokens)
 
@@ -109,7 +125,9 @@ async def _chat_gemini(
         log.warning("Gemini returned no candidates (possibly blocked by safety filters)")
         if hasattr(response, "prompt_feedback"):
             log.warning("Gemini prompt_feedback: %s", response.prompt_feedback)
-    log.info("Gemini response  len=%d  truncated=%s", len(text), truncated)
+    usage = response.usage_metadata
+    log.info("Gemini response  len=%d  truncated=%s  cached_tokens=%s", len(text), truncated,
+             (usage.cached_content_token_count or 0) if usage else "?")
     return ChatResult(text=text, truncated=truncated)
 
 
@@ -124,7 +142,12 @@ def _openai_client() -> AsyncOpenAI:
         base_url = base_url or "http://localhost:11434/v1"
         api_key = api_key or "ollama"
 
-    return AsyncOpenAI(api_key=api_key, base_url=base_url)
+    cached = _clients.get("openai")
+    if cached and cached[0] == (api_key, base_url):
+        return cached[1]
+    client = AsyncOpenAI(api_key=api_key, base_url=base_url)
+    _clients["openai"] = ((api_key, base_url), client)
+    return client
 
 
 async def _chat_openai(
@@ -151,11 +174,104 @@ async def _chat_openai(
     )
     text = resp.choices[0].message.content or ""
     truncated = resp.choices[0].finish_reason == "length"
-    log.info("OpenAI response  len=%d  truncated=%s  tokens_used=%s", len(text), truncated,
-             resp.usage.total_tokens if resp.usage else "?")
+    usage = resp.usage
+    cached = usage.prompt_tokens_details.cached_tokens if usage and usage.prompt_tokens_details else 0
+    log.info("OpenAI response  len=%d  truncated=%s  tokens_used=%s  cached_tokens=%s",
+             len(text), truncated, usage.total_tokens if usage else "?", cached or 0)
     return ChatResult(text=text, truncated=truncated)
 
 
+# ── OpenAI Batch API ────────────────────────────────────────────────────
+
+_BATCH_POLL_START = 30.0     # seconds before the first status check
+_BATCH_POLL_MAX = 600.0      # cap for the exponential poll back-off
+_BATCH_DONE = ("completed", "failed", "expired", "cancelled")
+
+
+def batch_supported() -> bool:
+    """The Batch API exists on OpenAI itself, not on Ollama / other compatible servers."""
+    return _provider() == "openai" and not _base_url()
+
+
+async def chat_batch(
+    requests: dict[str, tuple[str, str]],
+    for_translation: bool = False,
+    max_tokens: Optional[int] = None,
+    should_cancel: Optional[Callable[[], bool]] = None,
+) -> dict[str, ChatResult]:
+    """Submit {custom_id: (system_prompt, user_prompt)} as one OpenAI batch.
+
+    Waits for the batch to finish and returns the successful responses keyed
+    by custom_id.  Requests that failed or did not finish are missing from
+    the result, so callers can fall back to chat_ext() for them.  If
+    should_cancel() becomes true while waiting, the batch is cancelled and
+    whatever has completed so far is returned.
+    """
+    client = _openai_client()
+    model = _model(for_translation=for_translation)
+    max_tok = max_tokens or (settings.llm_translation_max_tokens if for_translation else settings.llm_max_tokens)
+
+    lines = []
+    for custom_id, (system_prompt, user_prompt) in requests.items():
+        lines.append(json.dumps({
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": model,
+                "temperature": _temperature(),
+                "max_tokens": max_tok,
+                "messages": [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+            },
+        }, ensure_ascii=False))
+
+    upload = await client.files.create(
+        file=("batch.jsonl", "\n".join(lines).encode("utf-8")),
+        purpose="batch",
+    )
+    batch = await client.batches.create(
+        input_file_id=upload.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    log.info("OpenAI batch %s submitted  model=%s  requests=%d", batch.id, model, len(lines))
+
+    delay = _BATCH_POLL_START
+    while batch.status not in _BATCH_DONE:
+        if should_cancel and should_cancel():
+            log.info("Cancelling OpenAI batch %s", batch.id)
+            batch = await client.batches.cancel(batch.id)
+            break
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, _BATCH_POLL_MAX)
+        batch = await client.batches.retrieve(batch.id)
+
+    log.info("OpenAI batch %s finished  status=%s", batch.id, batch.status)
+    results: dict[str, ChatResult] = {}
+    if not batch.output_file_id:
+        return results
+
+    content = await client.files.content(batch.output_file_id)
+    for line in content.text.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        response = record.get("response") or {}
+        if response.get("status_code") != 200:
+            log.warning("Batch request %s failed: %s", record.get("custom_id"),
+                        record.get("error") or response.get("status_code"))
+            continue
+        choice = response["body"]["choices"][0]
+        results[record["custom_id"]] = ChatResult(
+            text=choice["message"].get("content") or "",
+            truncated=choice.get("finish_reason") == "length",
+        )
+    return results
+
+
 # ── Web Search Helpers ──────────────────────────────────────────────────
 
 def _ddg_search(queries: list[str], max_results_per_query: int = 5) -> str:
@@ -183,11 +299,9 @@ async def _chat_gemini_with_search(
     max_tokens: Optional[int] = None,
 ) -> str:
     """Gemini call with Google Search grounding enabled."""
-    from google import genai
     from google.genai import types
 
-    api_key = _api_key()
-    client = genai.Client(api_key=api_key) if api_key else genai.Client()
+    client = _gemini_client()
     model = _model(for_translation=False)
     max_tok = max_tokens or settings.llm_max_tokens
 
@@ -220,8 +334,6 @@ async def chat_with_search(
     - Gemini: uses native Google Search grounding (search_queries ignored).
     - Others: runs DuckDuckGo searches first, prepends results to the prompt.
     """
-    import asyncio
-
     if _provider() == "gemini":
         return await _chat_gemini_with_search(system_prompt, user_prompt, max_tokens=max_tokens)
 
@@ -245,6 +357,16 @@ async def chat_with_search(
 
 # ── Public API ──────────────────────────────────────────────────────────
 
+def request_key(system_prompt: str, user_prompt: str, for_translation: bool = False) -> str:
+    """Digest identifying a request: same prompts, provider, model and temperature."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in (_provider(), _model(for_translation=for_translation), repr(_temperature()),
+                 system_prompt, user_prompt):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
 async def chat(
     system_prompt: str,
     user_prompt: str,
@@ -311,6 +433,11 @@ async def chat_json(
     return result
 
 
+_CODE_FENCE_RE = re.compile(r"```(?:json)?\s*\n?([\s\S]*?)\n?```")
+_DANGLING_STR_RE = re.compile(r',\s*"[^"]*$')
+_DANGLING_COMMA_RE = re.compile(r',\s*$')
+
+
 def _extract_json(text: str) -> dict | list:
     """Best-effort JSON extraction from LLM output. Returns dict, list, or {"raw": text}."""
     text = text.strip()
@@ -322,7 +449,7 @@ def _extract_json(text: str) -> dict | list:
     except json.JSONDecodeError:
         pass
     # Markdown code fence: ```json ... ``` or ``` ... ```
-    m = re.search(r"```(?:json)?\s*\n?([\s\S]*?)\n?```", text)
+    m = _CODE_FENCE_RE.search(text)
     if m:
         try:
             return json.loads(m.group(1).strip())
@@ -362,8 +489,8 @@ def _extract_json(text: str) -> dict | list:
     if start is not None and depth > 0:
         fragment = text[start:]
         # Strip trailing incomplete value (dangling comma, partial string, etc.)
-        fragment = re.sub(r',\s*"[^"]*$', '', fragment)
-        fragment = re.sub(r',\s*$', '', fragment)
+        fragment = _DANGLING_STR_RE.sub('', fragment)
+        fragment = _DANGLING_COMMA_RE.sub('', fragment)
         # Count unclosed structures and close them
         stack = []
         in_str = False
@@ -2,10 +2,20 @@
 from __future__ import annotations
 
 import asyncio
+import bisect
+import itertools
 import json
 import logging
+import multiprocessing
+import os
 import re
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from typing import Any, Coroutine, Iterator, TypeVar
 
 from . import llm_service
 from .epub_service import build_chapter_epub, build_translated_epub
@@ -15,8 +25,13 @@ from ..config import settings
 
 log = logging.getLogger(__name__)
 
-# Cancellation flags keyed by project_id
-_cancel_flags: dict[str, bool] = {}
+_T = TypeVar("_T")
+
+# Cancellation events keyed by project_id, present only while a run is active
+_cancel_events: dict[str, asyncio.Event] = {}
+# Runs in progress per project_id (translate_all counts, and so does each
+# chapter it translates); the event goes away with the last one
+_run_counts: dict[str, int] = {}
 
 _TRANSLATION_SYSTEM_BASE = """\
 You are a professional book translator translating from {source_lang} to {target_lang}. \
@@ -133,28 +148,33 @@ def _build_system_prompt(project: dict, strategy: dict) -> str:
 
 def _strip_chunk_header(text: str, ch_title: str, chunk_idx: int, total_chunks: int) -> str:
     """Remove any leaked chapter/chunk header lines from the AI's output."""
-    lines = text.split("\n")
+    # The chunk label markers depend only on the chunk, not the line
+    markers: tuple[str, ...] = ()
+    if total_chunks > 1:
+        markers = (f"(part {chunk_idx + 1}/{total_chunks})",
+                   f"({chunk_idx + 1}/{total_chunks})")
+    max_label_len = len(ch_title) + 30
+
     cleaned = []
-    for line in lines:
+    for line in text.split("\n"):
         stripped = line.strip()
-        # Skip lines that are the "── Chapter to Translate: ... ──" header
+        # Skip the "── Chapter to Translate: ... ──" header (this also
+        # covers "── {title} ──")
         if stripped.startswith("──") and stripped.endswith("──"):
             continue
-        # Skip lines that match the chunk label pattern: "title (part N/M)"
-        if total_chunks > 1:
-            part_marker = f"(part {chunk_idx + 1}/{total_chunks})"
-            alt_marker = f"({chunk_idx + 1}/{total_chunks})"
-            if part_marker in stripped or alt_marker in stripped:
-                if len(stripped) < len(ch_title) + 30:
-                    continue
         # Skip lines that are just the chapter title repeated
-        if stripped == ch_title or stripped == f"── {ch_title} ──":
+        if stripped == ch_title:
+            continue
+        # Skip lines that match the chunk label pattern: "title (part N/M)"
+        if markers and len(stripped) < max_label_len and (
+                markers[0] in stripped or markers[1] in stripped):
             continue
         cleaned.append(line)
     # Remove leading blank lines that result from stripping
-    while cleaned and not cleaned[0].strip():
-        cleaned.pop(0)
-    return "\n".join(cleaned)
+    start = 0
+    while start < len(cleaned) and not cleaned[start].strip():
+        start += 1
+    return "\n".join(cleaned[start:])
 
 
 def _split_translation_and_annotations(text: str) -> tuple[str, str]:
@@ -166,16 +186,50 @@ def _split_translation_and_annotations(text: str) -> tuple[str, str]:
     return text.strip(), ""
 
 
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _parse_annotations(ann_json: str) -> list:
+    """Parse the annotations array that follows the separator.
+
+    Entries are decoded one at a time, so when the array is cut off
+    (token limit) or wrapped in a code fence, every complete entry
+    before the break is still kept instead of the whole list being lost.
+    """
+    try:
+        parsed = json.loads(ann_json)
+        return parsed if isinstance(parsed, list) else []
+    except json.JSONDecodeError:
+        pass
+    pos = ann_json.find("[")
+    if pos < 0:
+        return []
+    items = []
+    pos += 1
+    n = len(ann_json)
+    while True:
+        while pos < n and ann_json[pos] in " \t\r\n,":
+            pos += 1
+        if pos >= n or ann_json[pos] == "]":
+            break
+        try:
+            item, pos = _JSON_DECODER.raw_decode(ann_json, pos)
+        except json.JSONDecodeError:
+            break
+        items.append(item)
+    if not items:
+        log.warning("Failed to parse annotations JSON (%d chars)", len(ann_json))
+    return items
+
+
 def _extract_translated_title(translated_text: str, original_title: str) -> str:
     """Extract the translated chapter title from the first line of translated text."""
-    lines = translated_text.strip().split("\n")
-    for line in lines:
-        stripped = line.strip()
-        if not stripped:
-            continue
-        if len(stripped) < 120 and not stripped.endswith(("。", ".", "！", "!", "？", "?", "」", '"', "…")):
-            return stripped
-        break
+    # Only the first non-blank line matters; avoid splitting the whole chapter
+    text = translated_text.lstrip()
+    end = text.find("\n")
+    first = (text if end < 0 else text[:end]).strip()
+    if first and len(first) < 120 and not first.endswith(("。", ".", "！", "!", "？", "?", "」", '"', "…")):
+        return first
     return ""
 
 
@@ -288,45 +342,124 @@ def _build_glossary_text(strategy: dict) -> str:
 
 
 def _build_context_section(chapters: list[dict], current_index: int) -> str:
-    """Build a context section from summaries of previous chapters."""
-    prev = [ch for ch in chapters if ch["chapter_index"] < current_index and ch.get("summary")]
+    """Build a context section from summaries of previous chapters.
+
+    chapters must be in chapter_index order, as the db returns them.
+    """
+    # Only the last five qualifying chapters are used: start just before the
+    # current chapter and walk back, stopping once five are found.
+    end = bisect.bisect_left(chapters, current_index, key=lambda c: c["chapter_index"])
+    prev: list[dict] = []
+    for i in range(end - 1, -1, -1):
+        ch = chapters[i]
+        if ch.get("summary"):
+            prev.append(ch)
+            if len(prev) == 5:
+                break
     if not prev:
         return ""
     lines = ["── Context from Previous Chapters ──\n"]
-    for ch in prev[-5:]:
+    for ch in reversed(prev):
         lines.append(f"Chapter {ch['chapter_index'] + 1} ({ch['title']}): {ch['summary']}\n")
     lines.append("")
     return "\n".join(lines)
 
 
+_UNSAFE_FNAME_RE = re.compile(r'[<>:"/\\|?*]')
+
+
+@lru_cache(maxsize=256)
+def _safe_project_name(name: str) -> str:
+    """Filesystem-safe form of a project name, used for output dir and file names."""
+    return _UNSAFE_FNAME_RE.sub('_', name)[:80].strip()
+
+
+def _output_dir(project: dict) -> Path:
+    """Output directory for a project, output/{book_name}/, without creating it."""
+    return settings.output_dir / _safe_project_name(project["name"])
+
+
 def _get_output_dir(project: dict) -> Path:
-    """Get the output directory for a project: output/{book_name}/"""
-    safe_name = re.sub(r'[<>:"/\\|?*]', '_', project["name"])[:80].strip()
-    out_dir = settings.output_dir / safe_name
+    """Get the output directory for a project, creating it for writing."""
+    out_dir = _output_dir(project)
     out_dir.mkdir(parents=True, exist_ok=True)
     return out_dir
 
 
-def _chapter_epub_path(project: dict, chapter: dict) -> Path:
-    """Get the EPUB path for a single chapter."""
-    out_dir = _get_output_dir(project)
+def chapter_epub_path(project: dict, chapter: dict) -> Path:
+    """Get the EPUB path for a single chapter.
+
+    Only computes the path: build_chapter_epub creates the directory when
+    writing, and lookups should not create empty directories."""
+    return _output_dir(project) / _chapter_epub_name(chapter)
+
+
+def _chapter_epub_name(chapter: dict) -> str:
+    """File name of a chapter's EPUB inside the project output directory."""
     idx = chapter["chapter_index"] + 1
-    safe_title = re.sub(r'[<>:"/\\|?*]', '_', chapter["title"])[:60].strip()
-    return out_dir / f"Ch{idx:03d}_{safe_title}.epub"
+    safe_title = _UNSAFE_FNAME_RE.sub('_', chapter["title"])[:60].strip()
+    return f"Ch{idx:03d}_{safe_title}.epub"
 
 
 # ── Stop support ────────────────────────────────────────────────────────
 
 def request_stop(project_id: str) -> None:
-    _cancel_flags[project_id] = True
+    """Stop the project's running translation; a no-op when nothing is running."""
+    event = _cancel_events.get(project_id)
+    if event is not None:
+        event.set()
 
 
 def _is_cancelled(project_id: str) -> bool:
-    return _cancel_flags.get(project_id, False)
+    event = _cancel_events.get(project_id)
+    return event is not None and event.is_set()
+
+
+@contextmanager
+def _stoppable_run(project_id: str) -> Iterator[None]:
+    """Scope of a translation run that request_stop can interrupt.
+
+    The first run of an idle project gets a fresh event, so no earlier stop
+    carries over into it; the entry is removed when the last run ends.
+    """
+    if not _run_counts.get(project_id):
+        _cancel_events[project_id] = asyncio.Event()
+    _run_counts[project_id] = _run_counts.get(project_id, 0) + 1
+    try:
+        yield
+    finally:
+        _run_counts[project_id] -= 1
+        if not _run_counts[project_id]:
+            del _run_counts[project_id]
+            _cancel_events.pop(project_id, None)
+
 
+async def _unless_stopped(project_id: str, coro: Coroutine[Any, Any, _T]) -> _T:
+    """Await coro, abandoning it as soon as a stop is requested for the project.
 
-def _clear_cancel(project_id: str) -> None:
-    _cancel_flags.pop(project_id, None)
+    Lets a stop interrupt an in-flight LLM request instead of waiting for it
+    to finish.  Raises _StopRequested if the stop wins.
+    """
+    stop = _cancel_events.get(project_id)
+    if stop is None:
+        return await coro
+    if stop.is_set():
+        coro.close()
+        raise _StopRequested()
+    task = asyncio.ensure_future(coro)
+    stop_wait = asyncio.ensure_future(stop.wait())
+    try:
+        done, _ = await asyncio.wait({task, stop_wait}, return_when=asyncio.FIRST_COMPLETED)
+    except BaseException:
+        task.cancel()
+        raise
+    finally:
+        stop_wait.cancel()
+    if task in done:
+        return task.result()
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    raise _StopRequested()
 
 
 class _StopRequested(Exception):
@@ -335,25 +468,46 @@ class _StopRequested(Exception):
 
 # ── Chunk-level progress tracking (in-memory) ──────────────────────────
 
-_chunk_progress: dict[str, dict] = {}
+@dataclass(slots=True)
+class ChunkProgress:
+    """Which chapter is being translated and how many of its chunks are done."""
+    chapter_index: int
+    chapter_title: str
+    chunk_done: int
+    chunk_total: int
+
 
+# project_id -> chapter_index -> progress; chapters of one project may be
+# translated side by side, each with its own chunk count.
+_chunk_progress: dict[str, dict[int, ChunkProgress]] = {}
 
-def get_chunk_progress(project_id: str) -> dict | None:
-    return _chunk_progress.get(project_id)
+
+def get_chunk_progress(project_id: str, chapter_index: int) -> ChunkProgress | None:
+    return _chunk_progress.get(project_id, {}).get(chapter_index)
 
 
 def _set_chunk_progress(project_id: str, chapter_index: int, chapter_title: str,
                         chunk_done: int, chunk_total: int) -> None:
-    _chunk_progress[project_id] = {
-        "chapter_index": chapter_index,
-        "chapter_title": chapter_title,
-        "chunk_done": chunk_done,
-        "chunk_total": chunk_total,
-    }
+    chapters = _chunk_progress.setdefault(project_id, {})
+    cp = chapters.get(chapter_index)
+    if cp is None:
+        chapters[chapter_index] = ChunkProgress(chapter_index, chapter_title, chunk_done, chunk_total)
+        return
+    cp.chapter_title = chapter_title
+    cp.chunk_done = chunk_done
+    cp.chunk_total = chunk_total
 
 
-def _clear_chunk_progress(project_id: str) -> None:
-    _chunk_progress.pop(project_id, None)
+def _clear_chunk_progress(project_id: str, chapter_index: int | None = None) -> None:
+    """Forget one chapter's progress, or the whole project's when no index is given."""
+    if chapter_index is None:
+        _chunk_progress.pop(project_id, None)
+        return
+    chapters = _chunk_progress.get(project_id)
+    if chapters is not None:
+        chapters.pop(chapter_index, None)
+        if not chapters:
+            del _chunk_progress[project_id]
 
 
 # ── Core translation ────────────────────────────────────────────────────
@@ -363,36 +517,44 @@ async def _translate_chunk_with_continuation(
     user_prompt: str,
     source_text: str,
     project: dict,
+    first_result: llm_service.ChatResult | None = None,
 ) -> str:
-    """Translate a chunk, auto-continuing if the LLM output is truncated."""
-    result = await llm_service.chat_ext(
+    """Translate a chunk, auto-continuing if the LLM output is truncated.
+
+    first_result, if given, is an already-fetched response to user_prompt
+    (e.g. from the Batch API) and replaces the initial call.
+    """
+    result = first_result or await llm_service.chat_ext(
         system_prompt=system_prompt,
         user_prompt=user_prompt,
         for_translation=True,
     )
-    translated = result.text
-
     if not result.truncated:
-        return translated
+        return result.text
+
+    # Pieces are joined with "\n" once at the end; only lengths and the
+    # last 500 chars are needed while continuing.
+    parts = [result.text]
+    translated_len = len(result.text)
+    src_len = max(len(source_text), 1)
+    cont_system = CONTINUATION_SYSTEM.format(
+        source_lang=project["source_language"],
+        target_lang=project["target_language"],
+    )
 
     # Auto-continuation loop
     for attempt in range(settings.max_continuations):
         log.warning("Translation truncated (attempt %d/%d), continuing…",
                     attempt + 1, settings.max_continuations)
 
-        tail = translated[-500:] if len(translated) > 500 else translated
-        translated_ratio = len(translated) / max(len(source_text), 1)
-        estimated_done = min(translated_ratio, 0.95)
+        last = parts[-1]
+        tail = last[-500:] if len(last) >= 500 else "\n".join(parts)[-500:]
+        estimated_done = min(translated_len / src_len, 0.95)
         remaining_start = int(len(source_text) * estimated_done * 0.9)
-        remaining = source_text[remaining_start:]
 
-        cont_system = CONTINUATION_SYSTEM.format(
-            source_lang=project["source_language"],
-            target_lang=project["target_language"],
-        )
         cont_user = CONTINUATION_USER.format(
             tail=tail,
-            remaining=remaining,
+            remaining=source_text[remaining_start:],
         )
 
         cont_result = await llm_service.chat_ext(
@@ -400,12 +562,32 @@ async def _translate_chunk_with_continuation(
             user_prompt=cont_user,
             for_translation=True,
         )
-        translated += "\n" + cont_result.text
+        parts.append(cont_result.text)
+        translated_len += 1 + len(cont_result.text)
 
         if not cont_result.truncated:
             break
 
-    return translated
+    return "\n".join(parts)
+
+
+def _split_chapter(text: str) -> list[str]:
+    max_chars = settings.max_chapter_chars
+    if len(text) <= max_chars:
+        return [text]
+    return _split_text(text, max_chars)
+
+
+def _chunk_user_prompt(context_section: str, ch_title: str, chunk: str,
+                       i: int, n_chunks: int) -> str:
+    chunk_label = ch_title
+    if n_chunks > 1:
+        chunk_label += f" (part {i + 1}/{n_chunks})"
+    return TRANSLATION_USER.format(
+        context_section=context_section,
+        chapter_title=chunk_label,
+        chapter_text=chunk,
+    )
 
 
 async def translate_chapter(
@@ -413,15 +595,38 @@ async def translate_chapter(
     chapter_id: str,
     feedback: str = "",
     strategy_overrides: dict | None = None,
+    prefetched: dict[str, llm_service.ChatResult] | None = None,
 ) -> str:
-    """Translate a single chapter, save per-chapter EPUB, return translated text."""
-    project = db.get_project(project_id)
-    strategy = db.get_strategy(project_id)
-    chapter = db.get_chapter(chapter_id)
-    all_chapters = db.get_chapters(project_id)
+    """Translate a single chapter, save per-chapter EPUB, return translated text.
+
+    prefetched maps llm_service.request_key() of a chunk's prompts to an
+    already-fetched first response; a chunk is only answered from it when
+    the prompts it sends now produce the same key, otherwise it is
+    requested as usual.
+    """
+    with _stoppable_run(project_id):
+        return await _translate_chapter(project_id, chapter_id, feedback,
+                                        strategy_overrides, prefetched)
+
+
+async def _translate_chapter(
+    project_id: str,
+    chapter_id: str,
+    feedback: str,
+    strategy_overrides: dict | None,
+    prefetched: dict[str, llm_service.ChatResult] | None,
+) -> str:
+    # Only summaries are needed from the other chapters (for context)
+    project, all_chapters = await asyncio.to_thread(
+        db.get_project_with_chapters,
+        project_id, fields=("chapter_index", "title", "summary"))
+    strategy = await asyncio.to_thread(db.get_strategy, project_id)
+    chapter = await asyncio.to_thread(db.get_chapter, chapter_id)
 
     if not project or not strategy or not chapter:
         raise ValueError("Missing project, strategy, or chapter data")
+    # The name map tracks the project's own strategy, not per-chapter overrides
+    project_strategy = strategy
 
     # Apply per-chapter strategy overrides if provided
     if strategy_overrides:
@@ -442,127 +647,174 @@ async def translate_chapter(
     context_section = _build_context_section(all_chapters, chapter["chapter_index"])
 
     text = chapter["original_content"]
-    max_chars = settings.max_chapter_chars
-    if len(text) <= max_chars:
-        chunks = [text]
-    else:
-        chunks = _split_text(text, max_chars)
-
-    log.info("Translating chapter %d (%s): %d chars → %d chunk(s)",
-             chapter["chapter_index"], chapter["title"], len(text), len(chunks))
+    chunks = _split_chapter(text)
 
-    ch_idx = chapter["chapter_index"]
-    ch_title = chapter["title"]
-    _set_chunk_progress(project_id, ch_idx, ch_title, 0, len(chunks))
-
-    async def _do_one_chunk(i: int, chunk: str) -> tuple[int, str, list]:
-        """Translate a single chunk; returns (index, translated_text, annotations)."""
-        chunk_label = ch_title
-        if len(chunks) > 1:
-            chunk_label += f" (part {i + 1}/{len(chunks)})"
-
-        user_prompt = TRANSLATION_USER.format(
-            context_section=context_section,
-            chapter_title=chunk_label,
-            chapter_text=chunk,
-        )
+    # The summary is of the original text, so it is requested alongside
+    # the chunks rather than after them
+    summary_task: asyncio.Task | None = None
+    if not chapter.get("summary"):
+        summary_task = asyncio.create_task(_summarize(chapter["title"], text))
 
-        raw_result = await _translate_chunk_with_continuation(
-            system_prompt=system_prompt,
-            user_prompt=user_prompt,
-            source_text=chunk,
-            project=project,
+    try:
+        log.info("Translating chapter %d (%s): %d chars → %d chunk(s)",
+                 chapter["chapter_index"], chapter["title"], len(text), len(chunks))
+
+        ch_idx = chapter["chapter_index"]
+        ch_title = chapter["title"]
+        _set_chunk_progress(project_id, ch_idx, ch_title, 0, len(chunks))
+
+        async def _do_one_chunk(i: int, chunk: str) -> tuple[int, str, list]:
+            """Translate a single chunk; returns (index, translated_text, annotations)."""
+            user_prompt = _chunk_user_prompt(context_section, ch_title, chunk, i, len(chunks))
+
+            # A chunk finished before a stop or failure is replayed, not re-requested
+            cache_key = llm_service.request_key(system_prompt, user_prompt, for_translation=True)
+            raw_result = await asyncio.to_thread(db.get_cached_chunk, chapter_id, cache_key)
+            if raw_result is None:
+                raw_result = await _unless_stopped(project_id, _translate_chunk_with_continuation(
+                    system_prompt=system_prompt,
+                    user_prompt=user_prompt,
+                    source_text=chunk,
+                    project=project,
+                    first_result=(prefetched or {}).get(cache_key),
+                ))
+                await asyncio.to_thread(db.save_cached_chunk, chapter_id, cache_key, raw_result)
+
+            ann_list = []
+            if enable_ann:
+                trans_text, ann_json = _split_translation_and_annotations(raw_result)
+                if ann_json:
+                    ann_list = _parse_annotations(ann_json)
+            else:
+                trans_text = raw_result
+            trans_text = _strip_chunk_header(trans_text, ch_title, i, len(chunks))
+            return i, trans_text, ann_list
+
+        translated_parts: list[str | None] = [None] * len(chunks)
+        chunk_annotations: list[list] = [[] for _ in chunks]
+        done_count = 0
+        persisted_count = 0
+        sem = asyncio.Semaphore(min(settings.parallel_chunks, len(chunks)))
+
+        def _translated_prefix() -> str:
+            """Chunks finished so far, up to the first one still in flight."""
+            done = itertools.takewhile(lambda p: p is not None, translated_parts)
+            return "\n\n".join(done)
+
+        async def _bounded_chunk(i: int) -> tuple[int, str, list]:
+            # Sliding window: a new chunk starts as soon as any one finishes,
+            # so a slow chunk no longer holds up a whole batch.
+            async with sem:
+                if _is_cancelled(project_id):
+                    raise _StopRequested()
+                return await _do_one_chunk(i, chunks[i])
+
+        tasks = [asyncio.create_task(_bounded_chunk(i)) for i in range(len(chunks))]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                idx, trans_text, ann_list = await next_done
+                translated_parts[idx] = trans_text
+                chunk_annotations[idx] = ann_list
+                done_count += 1
+
+                # Save partial progress every few chunks; the final text is
+                # written below and a stop request writes what is done.
+                if (done_count < len(chunks)
+                        and done_count - persisted_count >= settings.persist_every_n_chunks):
+                    await asyncio.to_thread(
+                        db.update_chapter, chapter_id, translated_content=_translated_prefix())
+                    persisted_count = done_count
+                _set_chunk_progress(project_id, ch_idx, ch_title, done_count, len(chunks))
+        except BaseException as e:
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if isinstance(e, _StopRequested):
+                partial = _translated_prefix()
+                if partial:
+                    await asyncio.to_thread(
+                        db.update_chapter, chapter_id, translated_content=partial, status="pending")
+                else:
+                    await asyncio.to_thread(db.update_chapter, chapter_id, status="pending")
+            raise
+
+        full_translation = "\n\n".join(p for p in translated_parts if p)
+        all_annotations = [a for anns in chunk_annotations for a in anns]
+
+        annotations_str = json.dumps(all_annotations, ensure_ascii=False) if all_annotations else ""
+        translated_title = _extract_translated_title(full_translation, chapter["title"])
+        # If extraction returned nothing, preserve the existing translated title
+        if not translated_title and chapter.get("translated_title"):
+            translated_title = chapter["translated_title"]
+
+        cur_ver = (chapter.get("translation_version") or 0) + 1
+        strategy_ver = strategy.get("version", 0)
+        # One transaction for the chapter row and its version entry, written
+        # from a worker thread so the commit does not stall other chapters.
+        await asyncio.to_thread(
+            db.save_chapter_translation,
+            project_id, chapter_id, cur_ver,
+            full_translation, translated_title, annotations_str,
+            feedback=feedback, strategy_version=strategy_ver,
         )
 
-        ann_list = []
-        if enable_ann:
-            trans_text, ann_json = _split_translation_and_annotations(raw_result)
-            if ann_json:
-                try:
-                    parsed = json.loads(ann_json)
-                    if isinstance(parsed, list):
-                        ann_list = parsed
-                except json.JSONDecodeError:
-                    log.warning("Failed to parse annotations JSON for chunk %d", i)
-        else:
-            trans_text = raw_result
-        trans_text = _strip_chunk_header(trans_text, ch_title, i, len(chunks))
-        return i, trans_text, ann_list
-
-    translated_parts: list[str | None] = [None] * len(chunks)
-    all_annotations = []
-    done_count = 0
-    concurrency = min(settings.parallel_chunks, len(chunks))
-
-    batch_start = 0
-    while batch_start < len(chunks):
-        if _is_cancelled(project_id):
-            filled = [p for p in translated_parts if p is not None]
-            if filled:
-                db.update_chapter(chapter_id, translated_content="\n\n".join(filled), status="pending")
-            raise _StopRequested()
-
-        batch_end = min(batch_start + concurrency, len(chunks))
-        tasks = [_do_one_chunk(i, chunks[i]) for i in range(batch_start, batch_end)]
-        results = await asyncio.gather(*tasks)
-
-        for idx, trans_text, ann_list in results:
-            translated_parts[idx] = trans_text
-            all_annotations.extend(ann_list)
-            done_count += 1
-
-        partial = "\n\n".join(p for p in translated_parts if p is not None)
-        db.update_chapter(chapter_id, translated_content=partial)
-        _set_chunk_progress(project_id, ch_idx, ch_title, done_count, len(chunks))
-        batch_start = batch_end
-
-    full_translation = "\n\n".join(p for p in translated_parts if p)
-
-    annotations_str = json.dumps(all_annotations, ensure_ascii=False) if all_annotations else ""
-    translated_title = _extract_translated_title(full_translation, chapter["title"])
-    # If extraction returned nothing, preserve the existing translated title
-    if not translated_title and chapter.get("translated_title"):
-        translated_title = chapter["translated_title"]
-
-    cur_ver = (chapter.get("translation_version") or 0) + 1
-    strategy_ver = strategy.get("version", 0)
-    db.update_chapter(chapter_id, translated_content=full_translation, status="translated",
-                      translated_title=translated_title, annotations=annotations_str,
-                      translation_version=cur_ver, strategy_version_used=strategy_ver)
-
-    db.save_translation_version(
-        project_id, chapter_id, cur_ver,
-        full_translation, translated_title, annotations_str,
-        feedback=feedback, strategy_version=strategy_ver,
-    )
-
-    display_title = _bilingual_title(chapter["title"], translated_title)
-    epub_path = _chapter_epub_path(project, chapter)
-    build_chapter_epub(
-        chapter_title=display_title,
-        translated_text=full_translation,
-        output_path=epub_path,
-        book_title=project["name"],
-    )
-
-    if not chapter.get("summary"):
-        summary = await _summarize(chapter["title"], text)
-        db.update_chapter(chapter_id, summary=summary)
+        display_title = _bilingual_title(chapter["title"], translated_title)
+        epub_path = chapter_epub_path(project, chapter)
 
-    _update_name_map(project_id, text, full_translation)
+        async def _store_summary() -> None:
+            if summary_task is None:
+                return
+            try:
+                summary = await summary_task
+            except Exception as e:
+                # Left empty; the next translation of this chapter asks again
+                log.warning("Failed to summarize chapter %s: %s", chapter_id, e)
+                return
+            await asyncio.to_thread(db.update_chapter, chapter_id, summary=summary)
+
+        # Package the chapter EPUB in a worker thread while any summary request
+        # is still in flight; both are done before the chapter counts as finished.
+        await asyncio.gather(
+            asyncio.to_thread(
+                build_chapter_epub,
+                chapter_title=display_title,
+                translated_text=full_translation,
+                output_path=epub_path,
+                book_title=project["name"],
+            ),
+            _store_summary(),
+        )
+    finally:
+        _clear_chunk_progress(project_id, chapter["chapter_index"])
+        # Not left running if anything above failed; a no-op once consumed
+        if summary_task is not None:
+            summary_task.cancel()
+            await asyncio.gather(summary_task, return_exceptions=True)
+
+    # Stays on the event loop: it read-modify-writes the project's name_map,
+    # as do rescans, name unification and imports, which would otherwise
+    # race with it.
+    _update_name_map(project_id, text, full_translation, strategy=project_strategy)
 
     log.info("Translated chapter %d: %s → %s (%d chars translated)",
              chapter["chapter_index"], chapter["title"], epub_path.name, len(full_translation))
     return full_translation
 
 
+_WORD_RE = re.compile(r'\S+')
+
+
 def _truncate_to_words(text: str, max_words: int) -> tuple[str, bool]:
     """Truncate text to approximately max_words. Returns (text, was_truncated)."""
-    words = text.split()
-    if len(words) <= max_words:
+    if max_words <= 0:
+        return "", bool(text.strip())
+    # Only the max_words-th word and whether another follows are needed; the
+    # rest of the text is never split into a word list.
+    edge = list(itertools.islice(_WORD_RE.finditer(text), max_words - 1, max_words + 1))
+    if len(edge) < 2:
         return text, False
     # Cut at word boundary, then find the last paragraph break for a clean cutoff
-    truncated = " ".join(words[:max_words])
+    truncated = text[:edge[0].end()]
     last_para = truncated.rfind("\n\n")
     if last_para > len(truncated) * 0.7:
         truncated = truncated[:last_para]
@@ -574,8 +826,9 @@ async def translate_sample(project_id: str, chapter_index: int | None = None) ->
 
     If chapter_index is None, defaults to chapter 0.
     """
-    project = db.get_project(project_id)
-    chapters = db.get_chapters(project_id)
+    # Locate the chapter by index first; only that one row needs its text.
+    project, chapters = db.get_project_with_chapters(
+        project_id, fields=("id", "chapter_index"))
     strategy = db.get_strategy(project_id)
     if not chapters or not project or not strategy:
         raise ValueError("No chapters or strategy found")
@@ -586,6 +839,7 @@ async def translate_sample(project_id: str, chapter_index: int | None = None) ->
     chapter = next((ch for ch in chapters if ch["chapter_index"] == idx), None)
     if chapter is None:
         raise ValueError(f"Chapter index {idx} not found")
+    chapter = db.get_chapter(chapter["id"])
 
     original_text = chapter["original_content"]
     sample_text, was_truncated = _truncate_to_words(original_text, settings.sample_max_words)
@@ -614,12 +868,9 @@ async def translate_sample(project_id: str, chapter_index: int | None = None) ->
         translated, ann_json = _split_translation_and_annotations(raw_result)
         annotations_str = ""
         if ann_json:
-            try:
-                parsed = json.loads(ann_json)
-                if isinstance(parsed, list):
-                    annotations_str = json.dumps(parsed, ensure_ascii=False)
-            except json.JSONDecodeError:
-                pass
+            parsed = _parse_annotations(ann_json)
+            if parsed:
+                annotations_str = json.dumps(parsed, ensure_ascii=False)
         db.update_chapter(chapter["id"], annotations=annotations_str)
     else:
         translated = raw_result
@@ -653,9 +904,14 @@ async def translate_all(
     end_chapter: int = -1,
 ) -> None:
     """Translate chapters in the given range (0-based inclusive). -1 means last chapter."""
-    _clear_cancel(project_id)
+    with _stoppable_run(project_id):
+        await _translate_all(project_id, start_chapter, end_chapter)
+
+
+async def _translate_all(project_id: str, start_chapter: int, end_chapter: int) -> None:
     project = db.get_project(project_id)
-    all_chapters = db.get_chapters(project_id)
+    # Loads every chapter's text; keep it off the event loop
+    all_chapters = await asyncio.to_thread(db.get_chapters, project_id)
     db.update_project(project_id, status="translating")
 
     if end_chapter < 0:
@@ -679,42 +935,198 @@ async def translate_all(
                 log.info("Chapter %d appears to be a sample excerpt (%.0f%% complete), resetting",
                          sample_ch["chapter_index"] + 1, completeness * 100)
                 db.update_chapter(sample_ch["id"], status="pending", translated_content="")
+                sample_ch.update(status="pending", translated_content="")
+
+    concurrency = max(1, min(settings.parallel_chapters, len(target_chapters)))
+    sem = asyncio.Semaphore(concurrency)
+
+    use_batch = (settings.use_batch_api
+                 and len(target_chapters) >= settings.batch_min_chapters
+                 and llm_service.batch_supported())
+
+    # Chapters translated side by side cannot wait for each other's
+    # summaries, which later chapters use as context.  Summaries are of the
+    # original text, so the missing ones can be produced ahead of time.
+    missing_ids = {
+        ch["id"] for ch in target_chapters
+        if not ch.get("summary") and (
+            ch["status"] != "translated" or not ch.get("translated_content"))
+    }
+    positions = {ch["id"]: pos for pos, ch in enumerate(target_chapters)}
+    summary_tasks: dict[str, asyncio.Task] = {}
 
-    try:
-        for ch in target_chapters:
+    async def _summarize_missing(ch: dict) -> None:
+        if _is_cancelled(project_id):
+            raise _StopRequested()
+        try:
+            summary = await _summarize(ch["title"], ch.get("original_content") or "")
+        except Exception as e:
+            # translate_chapter will try again once the chapter is done
+            log.warning("Failed to summarize chapter %s: %s", ch["id"], e)
+            return
+        db.update_chapter(ch["id"], summary=summary)
+
+    def _summary_task(ch: dict) -> asyncio.Task:
+        task = summary_tasks.get(ch["id"])
+        if task is None:
+            task = summary_tasks[ch["id"]] = asyncio.create_task(_summarize_missing(ch))
+        return task
+
+    async def _await_context_summaries(ch: dict) -> None:
+        """Wait for the summaries this chapter's context is built from (the
+        five target chapters before it) and for its own.  They are only
+        requested here, as chapters reach the semaphore, so a stopped run has
+        not paid for summaries of chapters it never started."""
+        pos = positions[ch["id"]]
+        await asyncio.gather(*(
+            _summary_task(c) for c in target_chapters[max(0, pos - 5):pos + 1]
+            if c["id"] in missing_ids
+        ))
+
+    async def _prefetch_summary(ch: dict) -> None:
+        async with sem:
+            await _summary_task(ch)
+
+    prefetched: dict[str, dict[str, llm_service.ChatResult]] = {}
+    # Chapter failures in the order they happened; once there is one, chapters
+    # still waiting on the semaphore are left pending instead of started.
+    failures: list[Exception] = []
+
+    async def _run(ch: dict) -> None:
+        async with sem:
             if _is_cancelled(project_id):
                 raise _StopRequested()
+            if failures:
+                return
 
-            fresh = db.get_chapter(ch["id"])
-            if fresh["status"] == "translated" and fresh.get("translated_content"):
-                continue
+            # Re-check just before starting: chapters start minutes apart and
+            # may have been translated elsewhere since the run began.
+            status, has_translation = db.get_chapter_status(ch["id"]) or ("", False)
+            if status == "translated" and has_translation:
+                return
+
+            if concurrency > 1:
+                await _await_context_summaries(ch)
 
             try:
-                await translate_chapter(project_id, ch["id"])
+                await translate_chapter(project_id, ch["id"], prefetched=prefetched.get(ch["id"]))
             except _StopRequested:
                 raise
             except Exception as e:
                 log.error("Failed to translate chapter %s: %s", ch["id"], e)
                 db.update_chapter(ch["id"], status="pending")
-                db.update_project(project_id, status="error",
-                                  error_message=f"Failed at chapter {ch['chapter_index'] + 1}: {e}")
+                # Chapters already in flight may fail too; report the first
+                if not failures:
+                    db.update_project(project_id, status="error",
+                                      error_message=f"Failed at chapter {ch['chapter_index'] + 1}: {e}")
+                failures.append(e)
                 raise
+
+    def _raise_first(results: list) -> None:
+        if any(isinstance(r, _StopRequested) for r in results):
+            raise _StopRequested()
+        if failures:
+            raise failures[0]
+        for r in results:
+            if isinstance(r, BaseException):
+                raise r
+
+    try:
+        if use_batch:
+            # Every chunk prompt is built at submission time, so the batch
+            # needs all the summaries first
+            _raise_first(await asyncio.gather(
+                *(_prefetch_summary(ch) for ch in target_chapters if ch["id"] in missing_ids),
+                return_exceptions=True))
+            prefetched.update(await _batch_translate_chunks(project_id, target_chapters))
+            if _is_cancelled(project_id):
+                raise _StopRequested()
+
+        _raise_first(await asyncio.gather(
+            *(_run(ch) for ch in target_chapters), return_exceptions=True))
     except _StopRequested:
-        _clear_cancel(project_id)
         _clear_chunk_progress(project_id)
         db.update_project(project_id, status="stopped",
                           error_message="Translation stopped by user")
         log.info("Translation stopped by user for project %s", project_id)
         return
+    finally:
+        # Summaries still in flight when the run stopped or failed
+        for task in summary_tasks.values():
+            task.cancel()
+        await asyncio.gather(*summary_tasks.values(), return_exceptions=True)
 
     _clear_chunk_progress(project_id)
     # Check if ALL chapters in the project are done
-    refreshed = db.get_chapters(project_id)
-    all_done = all(c["status"] == "translated" for c in refreshed)
+    statuses = [c["status"] for c in db.iter_chapters(project_id, fields=("status",))]
+    all_done = all(st == "translated" for st in statuses)
     db.update_project(project_id, status="completed" if all_done else "stopped")
     log.info("Translation batch complete for project %s (all_done=%s)", project_id, all_done)
 
 
+def _batch_requests(project_id: str, chapters: list[dict]) -> dict[str, tuple[str, str]]:
+    """Prompts for every chunk of the given untranslated chapters, keyed by
+    "chapter_id:chunk_index" and built exactly as translate_chapter builds them."""
+    project, ctx_chapters = db.get_project_with_chapters(
+        project_id, fields=("chapter_index", "title", "summary"))
+    strategy = db.get_strategy(project_id)
+    if not project or not strategy:
+        return {}
+    system_prompt = _build_system_prompt(project, strategy)
+
+    requests: dict[str, tuple[str, str]] = {}
+    for ch in chapters:
+        if ch["status"] == "translated" and ch.get("translated_content"):
+            continue
+        context_section = _build_context_section(ctx_chapters, ch["chapter_index"])
+        chunks = _split_chapter(ch["original_content"])
+        for i, chunk in enumerate(chunks):
+            user_prompt = _chunk_user_prompt(context_section, ch["title"], chunk, i, len(chunks))
+            requests[f"{ch['id']}:{i}"] = (system_prompt, user_prompt)
+    return requests
+
+
+async def _batch_translate_chunks(
+    project_id: str, chapters: list[dict],
+) -> dict[str, dict[str, llm_service.ChatResult]]:
+    """Fetch first-pass translations for every chunk of the given chapters
+    through the Batch API.
+
+    Returns {chapter_id: {request_key: result}}, keyed by
+    llm_service.request_key() of the prompts each result answers.
+    translate_chapter then uses these in place of its initial requests, so
+    continuation, annotation parsing, saving and EPUB output all run as
+    usual.  Chunks missing from the batch output, or whose prompts have
+    changed since (a summary filled in, a strategy edit), are simply
+    requested interactively.
+    """
+    # Reads every chapter's summary and builds all prompts; keep it off the loop
+    requests = await asyncio.to_thread(_batch_requests, project_id, chapters)
+    if not requests:
+        return {}
+
+    log.info("Submitting %d chunk(s) as a batch for project %s", len(requests), project_id)
+    results = await llm_service.chat_batch(
+        requests, for_translation=True,
+        should_cancel=lambda: _is_cancelled(project_id),
+    )
+
+    prefetched: dict[str, dict[str, llm_service.ChatResult]] = {}
+    for custom_id, result in results.items():
+        chapter_id = custom_id.rpartition(":")[0]
+        key = llm_service.request_key(*requests[custom_id], for_translation=True)
+        prefetched.setdefault(chapter_id, {})[key] = result
+    log.info("Batch returned %d/%d chunk(s) for project %s",
+             len(results), len(requests), project_id)
+    return prefetched
+
+
+# A maximal run of capitalized words.  Every word in a run is also a
+# standalone capitalized-word match, and runs of two or more words are exactly
+# the multi-word phrase matches, so one scan yields both counts.
+_CAP_RUN_RE = re.compile(r'\b[A-ZÀ-Ý][a-zà-ÿ]+(?:\s+[A-ZÀ-Ý][a-zà-ÿ]+)*\b')
+
+
 def _extract_names_from_text(text: str) -> dict[str, int]:
     """Extract character names from text using the known-names database.
 
@@ -725,20 +1137,21 @@ def _extract_names_from_text(text: str) -> dict[str, int]:
 
     Returns {name: occurrence_count}.
     """
-    hits: dict[str, int] = {}
-
-    # Single capitalized words that are known names
-    for m in re.finditer(r'\b([A-ZÀ-Ý][a-zà-ÿ]+)\b', text):
-        word = m.group(1)
-        if is_known_name(word):
-            hits[word] = hits.get(word, 0) + 1
+    runs = _CAP_RUN_RE.findall(text)
+
+    # Count each distinct capitalized word / phrase first (C-level Counter),
+    # so the known-name lookup runs once per distinct token, not per hit.
+    hits: dict[str, int] = {
+        word: count
+        for word, count in Counter(" ".join(runs).split()).items()
+        if is_known_name(word)
+    }
 
     # Multi-word capitalized sequences where >=1 word is a known name
-    for m in re.finditer(r'\b([A-ZÀ-Ý][a-zà-ÿ]+(?:\s+[A-ZÀ-Ý][a-zà-ÿ]+)+)\b', text):
-        phrase = m.group(1)
-        parts = phrase.split()
-        if len(phrase) < 50 and any(is_known_name(p) for p in parts):
-            hits[phrase] = hits.get(phrase, 0) + 1
+    phrases = Counter(run for run in runs if len(run.split()) > 1)
+    for phrase, count in phrases.items():
+        if len(phrase) < 50 and any(is_known_name(p) for p in phrase.split()):
+            hits[phrase] = count
 
     return hits
 
@@ -771,130 +1184,6 @@ def _collect_names_to_track(project_id: str) -> list[dict]:
     return [{"original": k, "translated": v} for k, v in names.items()]
 
 
-# ── Phonetic matching utilities for CJK name discovery ─────────────────
-_HAS_CJK_RE = re.compile(r'[\u4e00-\u9fff]')
-
-# Characters commonly used in Chinese transliteration of foreign names.
-# Comprehensive set (~600 chars) covering Xinhua conventions + common variants.
-# Organized by category for maintainability.
-_TRANSLIT_CHARS = frozenset(
-    # ─── High-frequency transliteration syllables ───
-    "阿巴贝布卡查达德迪多法菲弗盖格哈赫洪胡杰凯科克拉莱兰勒雷利里琳路卢"
-    "马曼梅米莫默穆纳尼诺帕佩彼皮普奎瑞萨赛珊舍施斯索塔特蒂图瓦维沃西夏辛"
-    "雅扬耶伊尤泽姆朗森伯罗瓜奥恩芬威丝尔亚安埃艾厄温叶基吉列日什茨捷宁夫"
-    "洛林依戈齐兹希约谢波托奇舒库鲁苏旺加提拜顿登迈费芙肯连彭泰休寇崔修芭"
-    "妮娅娜塞蕾黛沙丹瑟珀汀柯蒙乔迦若茜碧茉蓓佳柏桑亨福尔摩华玛丽琼瑰"
-    # ─── Common syllables often missed ───
-    "坦翰逊班甘坎坡垒培堡墨奈奥姆威娅姬孚宾寇密尤岑岚巴庞廷弥恺慕戈扎"
-    "敖斐昂昆曼朱杜松柯梅桂棱欧沁沛泊泽浦涅淮渥漫潘焦熙牧琦瑰瓦畅盎祖"
-    "禄穆笛纪翡聪腓艾荻莉莎莱莲菈菩葛蒂蔡裴褚覃赫赖迪逸郝鄂霍韦鲍黎"
-    # ─── Traditional / literary transliteration chars ───
-    "生翁耐聂萧蒲裘詹贡郎铎锡雁颜魏鸿仑伍伦佐佩侬俄傅儒凡凤刚劳勃勋博"
-    "卓卫厉史吕哥唐嗣士娃孔宋寅尧巍康彤律悉惠戴拂摩敏旺易曹汉汤沙浑海烈"
-    "爵珠琪琴珂珈瑙瑶璐璃嘉露蕊薇蔻绮翠茵荷苔芮蓉蕾纶缪罕门铁铭锐霖钟"
-    "鑫韩鸿黛凰珍玲瑛甄"
-    # ─── Characters for non-standard but common transliterations ───
-    "保冈古可台吉司因尼思惠拂敦昌明杰根歌津满炎照瑟甫白石竹纯罗肖苗"
-)
-
-try:
-    from pypinyin import lazy_pinyin, Style
-    _HAS_PYPINYIN = True
-except ImportError:
-    _HAS_PYPINYIN = False
-
-
-def _extract_cjk_name_candidates(text: str) -> dict[str, int]:
-    """Extract likely transliterated name tokens from Chinese text.
-
-    Scans for maximal consecutive runs of transliteration characters,
-    which are very likely to be foreign name transliterations.
-    """
-    counts: dict[str, int] = {}
-    i = 0
-    n = len(text)
-    while i < n:
-        if text[i] in _TRANSLIT_CHARS:
-            j = i + 1
-            while j < n and text[j] in _TRANSLIT_CHARS:
-                j += 1
-            token = text[i:j]
-            if 2 <= len(token) <= 8:
-                counts[token] = counts.get(token, 0) + 1
-            i = j
-        else:
-            i += 1
-    return counts
-
-
-def _phonetic_similarity(english_name: str, chinese_token: str) -> float:
-    """Compute phonetic similarity between an English name and a Chinese token.
-
-    Uses pypinyin to convert the Chinese token to pinyin, then compares
-    using multiple phonetic heuristics. Returns 0.0-1.0.
-    """
-    if not _HAS_PYPINYIN:
-        return 0.0
-
-    pinyin_parts = lazy_pinyin(chinese_token, style=Style.NORMAL)
-    pinyin_str = "".join(pinyin_parts).lower()
-    eng = english_name.lower()
-
-    if not pinyin_str or not eng:
-        return 0.0
-
-    # Chinese transliteration often maps English consonants to different
-    # pinyin initials. Build equivalence groups rather than pairs.
-    _equiv_groups = [
-        {"l", "r", "n"},        # l/r/n interchange
-        {"b", "p"},             # b/p
-        {"d", "t"},             # d/t
-        {"g", "k"},             # g/k
-        {"v", "w", "f"},        # v/w/f (Watson→华sheng, Valerie→瓦)
-        {"s", "z", "c", "x"},   # s/z/c/x (Sherlock→夏xia)
-        {"sh", "x", "s"},       # sh/x (Sherlock→夏)
-        {"h", "f", "hu"},       # h/f (Holmes→福fu)
-        {"j", "zh", "g"},       # j/zh/g
-    ]
-
-    def _consonants_match(c1: str, c2: str) -> bool:
-        if c1 == c2:
-            return True
-        for group in _equiv_groups:
-            if c1 in group and c2 in group:
-                return True
-        return False
-
-    # First consonant matching
-    first_match = 1.0 if pinyin_str[0] == eng[0] else 0.0
-    if first_match == 0.0:
-        # Check first 1-2 chars of each
-        for plen in (2, 1):
-            for elen in (2, 1):
-                if plen <= len(pinyin_str) and elen <= len(eng):
-                    if _consonants_match(pinyin_str[:plen], eng[:elen]):
-                        first_match = 0.7
-                        break
-            if first_match > 0:
-                break
-
-    # Longest common subsequence ratio (more robust than bag-of-chars)
-    m, n = len(pinyin_str), len(eng)
-    if m > 20 or n > 20:
-        lcs_ratio = 0.0
-    else:
-        dp = [[0] * (n + 1) for _ in range(m + 1)]
-        for i in range(1, m + 1):
-            for j in range(1, n + 1):
-                if pinyin_str[i-1] == eng[j-1]:
-                    dp[i][j] = dp[i-1][j-1] + 1
-                else:
-                    dp[i][j] = max(dp[i-1][j], dp[i][j-1])
-        lcs_ratio = dp[m][n] / max(m, n) if max(m, n) > 0 else 0.0
-
-    return first_match * 0.5 + lcs_ratio * 0.5
-
-
 # Matches: 1-8 CJK/Kana chars immediately before a parenthesised Latin name.
 # Group 1 = translated name (CJK token), Group 2 = original name (Latin).
 _ANNOTATION_RE = re.compile(
@@ -905,22 +1194,29 @@ _ANNOTATION_RE = re.compile(
 )
 
 
-def _extract_annotation_pairs(translated_text: str) -> dict[str, set[str]]:
-    """Extract {original_name: {translated_variant, ...}} from parenthetical
-    annotations like 默里（Murray） or 贝克街（Baker Street）."""
+def _split_annotations(translated_text: str) -> tuple[dict[str, set[str]], str]:
+    """Read parenthetical annotations like 默里（Murray） or 贝克街（Baker Street）.
+
+    Returns ({original_name: {translated_variant, ...}}, clean_text), where
+    clean_text has the parenthesised originals removed so that raw original
+    names inside parentheses are not counted as translation variants.  Both
+    come from a single pass of the annotation regex.
+    """
     pairs: dict[str, set[str]] = {}
+    parts: list[str] = []
+    last = 0
     for m in _ANNOTATION_RE.finditer(translated_text):
         trans_name = m.group(1).strip()
         orig_name = m.group(2).strip()
         if orig_name and trans_name and len(trans_name) <= 8:
             pairs.setdefault(orig_name, set()).add(trans_name)
-    return pairs
-
-
-def _strip_annotations(text: str) -> str:
-    """Remove parenthetical original-language annotations so that the raw
-    original names inside parentheses are not counted as translation variants."""
-    return _ANNOTATION_RE.sub(lambda m: m.group(1), text)
+        parts.append(translated_text[last:m.start()])
+        parts.append(m.group(1))
+        last = m.end()
+    if not parts:
+        return pairs, translated_text
+    parts.append(translated_text[last:])
+    return pairs, "".join(parts)
 
 
 def _is_valid_translation(text: str) -> bool:
@@ -932,62 +1228,52 @@ def _is_valid_translation(text: str) -> bool:
     return True
 
 
-def _anno_name_matches(anno_orig: str, target_name: str) -> bool:
-    """Check if an annotation's original name matches the target name.
-    Requires exact match (case-insensitive) or that the annotation is one
-    of the space-separated parts of a multi-word target name."""
-    if anno_orig.lower() == target_name.lower():
-        return True
-    # "Murray" in annotation matches target "Murray Donovan"
-    target_parts = target_name.lower().split()
-    if len(target_parts) >= 2 and anno_orig.lower() in target_parts:
-        return True
-    # "John Smith" in annotation matches target "John Smith"
-    anno_parts = anno_orig.lower().split()
-    if len(anno_parts) >= 2 and anno_parts == target_parts:
-        return True
-    return False
-
-
-def _scan_translation_variants(
-    original_name: str,
-    translated_text: str,
-    known_translations: list[str],
-) -> dict[str, int]:
-    """Find all translation variants for a name in translated text.
-
-    Uses parenthetical annotations, known translations, and original-name
-    retention detection.  Parenthetical original-language text is stripped
-    before counting to avoid inflating variant stats.
-    """
-    variants: dict[str, int] = {}
-
-    anno_pairs = _extract_annotation_pairs(translated_text)
-    for anno_orig, trans_set in anno_pairs.items():
-        if _anno_name_matches(anno_orig, original_name):
-            for tname in trans_set:
-                if _is_valid_translation(tname):
-                    variants[tname] = variants.get(tname, 0) + 1
-
-    clean_text = _strip_annotations(translated_text)
-
-    for trans in known_translations:
-        if trans and _is_valid_translation(trans) and trans in clean_text:
-            variants[trans] = max(variants.get(trans, 0), clean_text.count(trans))
-
-    if original_name in clean_text:
-        cnt = clean_text.count(original_name)
-        if cnt > 0:
-            variants[original_name] = max(variants.get(original_name, 0), cnt)
-
-    return variants
-
-
-def _collect_names_quick(project_id: str, original_text: str) -> list[dict]:
-    """Fast version for per-chapter updates: strategy/analysis names + names from this chapter."""
+class _AnnotationIndex:
+    """One chapter's annotation pairs, indexed for matching against names.
+
+    An annotation matches a target name on an exact (case-insensitive)
+    match, when it is one of the space-separated parts of a multi-word
+    target ("Murray" matches "Murray Donovan"), or when both are the same
+    multi-word name.  Lower-casing and splitting happen once per annotation
+    here, so matching a name is a few dict lookups rather than a pass over
+    every annotation."""
+
+    __slots__ = ("_trans_sets", "_by_lower", "_by_parts")
+
+    def __init__(self, anno_pairs: dict[str, set[str]]):
+        self._trans_sets = list(anno_pairs.values())
+        self._by_lower: dict[str, list[int]] = {}
+        self._by_parts: dict[tuple[str, ...], list[int]] = {}
+        for pos, anno_orig in enumerate(anno_pairs):
+            lower = anno_orig.lower()
+            self._by_lower.setdefault(lower, []).append(pos)
+            parts = tuple(lower.split())
+            if len(parts) >= 2:
+                self._by_parts.setdefault(parts, []).append(pos)
+
+    def matching(self, target_name: str) -> list[set[str]]:
+        """Translation sets of the matching annotations, in text order."""
+        target_lower = target_name.lower()
+        hits = set(self._by_lower.get(target_lower, ()))
+        target_parts = target_lower.split()
+        if len(target_parts) >= 2:
+            for part in target_parts:
+                hits.update(self._by_lower.get(part, ()))
+            hits.update(self._by_parts.get(tuple(target_parts), ()))
+        return [self._trans_sets[pos] for pos in sorted(hits)]
+
+
+def _collect_names_quick(project_id: str, original_text: str,
+                         strategy: dict | None = None,
+                         analysis: dict | None = None) -> list[dict]:
+    """Fast version for per-chapter updates: strategy/analysis names + names from this chapter.
+
+    Callers that already hold the strategy or analysis can pass them in to
+    skip the database read; otherwise they are loaded here."""
     names: dict[str, str] = {}
 
-    strategy = db.get_strategy(project_id)
+    if strategy is None:
+        strategy = db.get_strategy(project_id)
     if strategy:
         for n in (strategy.get("character_names") or []):
             if isinstance(n, dict) and n.get("original"):
@@ -996,7 +1282,8 @@ def _collect_names_quick(project_id: str, original_text: str) -> list[dict]:
             if isinstance(g, dict) and g.get("source"):
                 names.setdefault(g["source"], g.get("target", ""))
 
-    analysis = db.get_analysis(project_id)
+    if analysis is None:
+        analysis = db.get_analysis(project_id)
     if analysis:
         for c in (analysis.get("characters") or []):
             if isinstance(c, dict) and c.get("name"):
@@ -1009,9 +1296,11 @@ def _collect_names_quick(project_id: str, original_text: str) -> list[dict]:
     return [{"original": k, "translated": v} for k, v in names.items()]
 
 
-def _update_name_map(project_id: str, original_text: str, translated_text: str) -> None:
+def _update_name_map(project_id: str, original_text: str, translated_text: str,
+                     strategy: dict | None = None,
+                     analysis: dict | None = None) -> None:
     """Scan original/translated text for character names and update name_map."""
-    names_to_track = _collect_names_quick(project_id, original_text)
+    names_to_track = _collect_names_quick(project_id, original_text, strategy, analysis)
     if not names_to_track:
         return
 
@@ -1022,6 +1311,11 @@ def _update_name_map(project_id: str, original_text: str, translated_text: str)
     except (json.JSONDecodeError, TypeError):
         name_map = {}
 
+    # Annotation extraction and stripping depend only on the chapter, not
+    # on the name being tracked, so do them once up front.
+    annotations: _AnnotationIndex | None = None
+    clean_text = ""
+
     for entry in names_to_track:
         orig = entry["original"]
         count_in_orig = original_text.count(orig)
@@ -1035,53 +1329,51 @@ def _update_name_map(project_id: str, original_text: str, translated_text: str)
 
         known_trans = [entry.get("translated", "")]
         known_trans += list(name_map[orig].get("translations", {}).keys())
-        variants = _scan_translation_variants(orig, translated_text, known_trans)
+        if annotations is None:
+            anno_pairs, clean_text = _split_annotations(translated_text)
+            annotations = _AnnotationIndex(anno_pairs)
+        variants = _scan_variants_fast(orig, clean_text, annotations, known_trans)
+        translations = name_map[orig]["translations"]
         for trans, cnt in variants.items():
-            name_map[orig]["translations"][trans] = (
-                name_map[orig]["translations"].get(trans, 0) + cnt
-            )
+            translations[trans] = translations.get(trans, 0) + cnt
 
     db.update_project(project_id, name_map=json.dumps(name_map, ensure_ascii=False))
 
 
 def _precompute_chapter(args: tuple) -> dict:
-    """Pre-compute expensive per-chapter data once (runs in thread pool)."""
-    idx, orig, trans, is_cjk = args
-    anno_pairs = _extract_annotation_pairs(trans)
-    clean = _strip_annotations(trans)
-    cjk_candidates = _extract_cjk_name_candidates(trans) if is_cjk else {}
+    """Pre-compute expensive per-chapter data once."""
+    idx, orig, trans = args
+    anno_pairs, clean = _split_annotations(trans)
     return {
         "idx": idx,
         "orig": orig,
         "clean": clean,
-        "anno_pairs": anno_pairs,
-        "cjk_candidates": cjk_candidates,
+        "annotations": _AnnotationIndex(anno_pairs),
     }
 
 
 def _scan_variants_fast(
     original_name: str,
     clean_text: str,
-    anno_pairs: dict[str, set[str]],
+    annotations: _AnnotationIndex,
     known_translations: list[str],
 ) -> dict[str, int]:
     """Fast variant scan using pre-computed annotation pairs and stripped text."""
-    variants: dict[str, int] = {}
+    variants: Counter[str] = Counter()
 
-    for anno_orig, trans_set in anno_pairs.items():
-        if _anno_name_matches(anno_orig, original_name):
-            for tname in trans_set:
-                if _is_valid_translation(tname):
-                    variants[tname] = variants.get(tname, 0) + 1
+    for trans_set in annotations.matching(original_name):
+        for tname in trans_set:
+            if _is_valid_translation(tname):
+                variants[tname] += 1
 
     for trans in known_translations:
         if trans and _is_valid_translation(trans) and trans in clean_text:
-            variants[trans] = max(variants.get(trans, 0), clean_text.count(trans))
+            variants[trans] = max(variants[trans], clean_text.count(trans))
 
     if original_name in clean_text:
         cnt = clean_text.count(original_name)
         if cnt > 0:
-            variants[original_name] = max(variants.get(original_name, 0), cnt)
+            variants[original_name] = max(variants[original_name], cnt)
 
     return variants
 
@@ -1146,21 +1438,29 @@ async def _ai_verify_names(
     # Build a case-insensitive lookup so we can map AI's response back
     name_lookup: dict[str, str] = {n.lower().strip(): n for n in names}
 
-    total_batches = (len(names) + _NAME_BATCH_SIZE - 1) // _NAME_BATCH_SIZE
-    for batch_idx, i in enumerate(range(0, len(names), _NAME_BATCH_SIZE)):
-        batch = names[i:i + _NAME_BATCH_SIZE]
-        if project_id:
-            _set_name_scan_status(project_id, "ai_verify",
-                                  f"AI batch {batch_idx + 1}/{total_batches}",
-                                  batch_idx, total_batches)
+    batches = [names[i:i + _NAME_BATCH_SIZE]
+               for i in range(0, len(names), _NAME_BATCH_SIZE)]
+    total_batches = len(batches)
+    system_prompt = _NAME_VERIFY_SYSTEM.format(
+        source_lang=source_lang, target_lang=target_lang)
+    # Batches are independent requests; overlap them like chunk requests.
+    sem = asyncio.Semaphore(max(1, settings.parallel_chunks))
+    batches_done = 0
+    if project_id:
+        _set_name_scan_status(project_id, "ai_verify",
+                              f"AI batch 0/{total_batches}", 0, total_batches)
+
+    async def _verify_batch(batch: list[str]) -> dict[str, list[str]]:
+        nonlocal batches_done
+        found: dict[str, list[str]] = {}
         prompt = "Names:\n" + "\n".join(f"- {n}" for n in batch)
         try:
-            resp = await llm_service.chat_json(
-                system_prompt=_NAME_VERIFY_SYSTEM.format(
-                    source_lang=source_lang, target_lang=target_lang),
-                user_prompt=prompt,
-                max_tokens=4096,
-            )
+            async with sem:
+                resp = await llm_service.chat_json(
+                    system_prompt=system_prompt,
+                    user_prompt=prompt,
+                    max_tokens=4096,
+                )
             entries = resp if isinstance(resp, list) else resp.get("names", resp.get("result", []))
             for entry in entries:
                 if not isinstance(entry, dict) or not entry.get("name"):
@@ -1175,44 +1475,182 @@ async def _ai_verify_names(
                     continue
                 ai_name = entry["name"].strip()
                 canonical = name_lookup.get(ai_name.lower(), ai_name)
-                result[canonical] = clean_trans
+                found[canonical] = clean_trans
         except Exception as e:
             log.warning("AI name verification batch failed: %s", e)
+        batches_done += 1
+        if project_id:
+            _set_name_scan_status(project_id, "ai_verify",
+                                  f"AI batch {batches_done}/{total_batches}",
+                                  batches_done, total_batches)
+        return found
+
+    # Merge in batch order so later batches win exactly as they did serially
+    for found in await asyncio.gather(*(_verify_batch(b) for b in batches)):
+        result.update(found)
     return result
 
 
+def _iter_paired_chapters(project_id: str):
+    """Yield (original, translated) text for each translated chapter."""
+    for ch in db.iter_chapters(project_id, fields=("original_content", "translated_content")):
+        orig = ch.get("original_content") or ""
+        trans = ch.get("translated_content") or ""
+        if orig and trans:
+            yield orig, trans
+
+
+def _count_raw_names(project_id: str) -> tuple[dict[str, int], int]:
+    """Extract candidate names from every translated chapter's original text.
+
+    Returns ({name: occurrence_count}, number_of_translated_chapters)."""
+    raw_names: Counter[str] = Counter()
+    n_chapters = 0
+    for orig, _ in _iter_paired_chapters(project_id):
+        n_chapters += 1
+        raw_names.update(_extract_names_from_text(orig))
+    return raw_names, n_chapters
+
+
+def _scan_chapter(pc: dict, verified_names: dict[str, list[str]]) -> dict[str, tuple[int, dict[str, int]]]:
+    """Search one pre-computed chapter for every verified name.
+
+    Returns {name: (count_in_orig, {translation: count})} for the names
+    that occur in the chapter's original text."""
+    found: dict[str, tuple[int, dict[str, int]]] = {}
+    clean = pc["clean"]
+    # Related names share translations ("Holmes" / "Sherlock Holmes" both
+    # list 福尔摩斯), so count each distinct needle in the chapter only once.
+    clean_counts: dict[str, int] = {}
+    for orig_name, ai_trans_list in verified_names.items():
+        count_in_orig = pc["orig"].count(orig_name)
+        if not count_in_orig:
+            # No evidence for this name in the chapter: skip the
+            # translation search entirely.
+            continue
+        variants: Counter[str] = Counter()
+
+        # Search annotation-extracted translations
+        for trans_set in pc["annotations"].matching(orig_name):
+            for tname in trans_set:
+                if _is_valid_translation(tname):
+                    variants[tname] += 1
+
+        # Search AI-suggested translations in cleaned text, and check if
+        # the original name was retained in the translation.  A single
+        # count() per needle; an "in" test first would scan hits twice.
+        for needle in itertools.chain(ai_trans_list, (orig_name,)):
+            if not needle:
+                continue
+            cnt = clean_counts.get(needle)
+            if cnt is None:
+                cnt = clean_counts[needle] = clean.count(needle)
+            if cnt:
+                variants[needle] += cnt
+
+        found[orig_name] = (count_in_orig, variants)
+    return found
+
+
+# Verified names for the current rescan, set once per worker process.
+_worker_verified_names: dict[str, list[str]] = {}
+
+
+def _init_scan_worker(verified_names: dict[str, list[str]]) -> None:
+    global _worker_verified_names
+    _worker_verified_names = verified_names
+
+
+def _scan_chapter_task(item: tuple[int, str, str]) -> dict[str, tuple[int, dict[str, int]]]:
+    """Worker-process entry point: pre-compute and scan one chapter."""
+    return _scan_chapter(_precompute_chapter(item), _worker_verified_names)
+
+
+def _scan_results(chapters, verified_names: dict[str, list[str]]):
+    """Yield (ch_idx, found) for each (orig, trans) pair, in chapter order.
+
+    With ``name_scan_processes`` > 1 the chapters are scanned in worker
+    processes (the scan is CPU-bound ``str.count`` work, so threads would
+    serialise on the GIL).  Only a small window of chapters is in flight at
+    a time, so the book is still streamed rather than loaded whole."""
+    items = ((ch_idx, orig, trans) for ch_idx, (orig, trans) in enumerate(chapters))
+    workers = settings.name_scan_processes
+    if workers <= 1:
+        for item in items:
+            yield item[0], _scan_chapter(_precompute_chapter(item), verified_names)
+        return
+
+    # "spawn" rather than fork: this runs on a worker thread of the server
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_scan_worker,
+        initargs=(verified_names,),
+    ) as pool:
+        pending: deque = deque()
+        for item in items:
+            pending.append((item[0], pool.submit(_scan_chapter_task, item)))
+            if len(pending) >= workers * 2:
+                ch_idx, fut = pending.popleft()
+                yield ch_idx, fut.result()
+        while pending:
+            ch_idx, fut = pending.popleft()
+            yield ch_idx, fut.result()
+
+
+def _search_names(project_id: str, verified_names: dict[str, list[str]],
+                  n_chapters: int) -> dict:
+    """Stream translated chapters once and build the name map for all names."""
+    names = list(verified_names)
+    name_index = {n: i for i, n in enumerate(names)}
+    # Only the book-wide total of original-text occurrences is used per name
+    name_totals = [0] * len(names)
+    all_translations: list[Counter[str]] = [Counter() for _ in names]
+
+    chapters = itertools.islice(_iter_paired_chapters(project_id), n_chapters)
+    for ch_idx, found in _scan_results(chapters, verified_names):
+        for orig_name, (count_in_orig, variants) in found.items():
+            name_idx = name_index[orig_name]
+            name_totals[name_idx] += count_in_orig
+            all_translations[name_idx].update(variants)
+
+        if (ch_idx + 1) % 10 == 0:
+            _set_name_scan_status(project_id, "searching",
+                                  f"Chapter {ch_idx + 1}/{n_chapters}",
+                                  done=ch_idx + 1, total=n_chapters)
+
+    name_map: dict = {}
+    for name_idx, orig_name in enumerate(names):
+        total = name_totals[name_idx]
+        if total > 1:
+            name_map[orig_name] = {"total": total, "translations": dict(all_translations[name_idx])}
+    return name_map
+
+
 async def rescan_all_names(project_id: str) -> dict:
     """Re-scan all translated chapters to rebuild the name map.
 
     Phase 1: Extract candidate names from original text.
     Phase 2: Ask AI to verify which are real names and get translation variants.
-    Phase 3: Pre-compute per-chapter annotation pairs + stripped text.
-    Phase 4: For each verified name, count occurrences in original text and
-             search all AI-suggested translations + annotation-discovered
+    Phase 3: For each chapter, pre-compute annotation pairs + stripped text,
+             then count every verified name in the original text and search
+             all AI-suggested translations + annotation-discovered
              translations in the translated text.
-    """
-    from concurrent.futures import ThreadPoolExecutor
 
+    Chapters are streamed from the database in both passes, so only one
+    chapter's text is held in memory at a time.
+    """
     project = db.get_project(project_id)
     source_lang = project.get("source_language", "English") if project else "English"
     target_lang = project.get("target_language", "Chinese") if project else "Chinese"
 
-    chapters = db.get_chapters(project_id)
-    paired = []
-    for ch in chapters:
-        orig = ch.get("original_content") or ""
-        trans = ch.get("translated_content") or ""
-        if orig and trans:
-            paired.append((orig, trans))
+    # ── Phase 1: collect candidate names ─────────────────────────────
+    raw_names, n_chapters = await asyncio.to_thread(_count_raw_names, project_id)
 
-    if not paired:
+    if not n_chapters:
         log.info("No translated chapters for project %s", project_id)
         return {}
 
-    # ── Phase 1: collect candidate names ─────────────────────────────
-    all_orig_text = " ".join(orig for orig, _ in paired)
-    raw_names = _extract_names_from_text(all_orig_text)
-
     # Also include names from strategy / analysis
     strategy_names: dict[str, str] = {}
     strategy = db.get_strategy(project_id)
@@ -1261,54 +1699,14 @@ async def rescan_all_names(project_id: str) -> dict:
 
     log.info("AI verified %d names out of %d candidates", len(verified_names), len(candidate_names))
     _set_name_scan_status(project_id, "searching",
-                          f"Searching {len(verified_names)} names across {len(paired)} chapters",
-                          done=0, total=len(verified_names))
-
-    # ── Phase 3: pre-compute chapter data in parallel ────────────────
-    is_cjk = bool(_HAS_CJK_RE.search(paired[0][1][:500]))
-    tasks = [(i, orig, trans, is_cjk) for i, (orig, trans) in enumerate(paired)]
-    with ThreadPoolExecutor(max_workers=min(8, len(tasks))) as pool:
-        precomputed = list(pool.map(_precompute_chapter, tasks))
-    precomputed.sort(key=lambda d: d["idx"])
+                          f"Searching {len(verified_names)} names across {n_chapters} chapters",
+                          done=0, total=n_chapters)
 
-    # ── Phase 4: local search with AI-provided translations ──────────
-    name_map: dict = {}
-    search_idx = 0
-
-    for orig_name, ai_trans_list in verified_names.items():
-        search_idx += 1
-        if search_idx % 20 == 0:
-            _set_name_scan_status(project_id, "searching", orig_name,
-                                  done=search_idx, total=len(verified_names))
-        total = 0
-        all_translations: dict[str, int] = {}
-
-        for pc in precomputed:
-            count_in_orig = pc["orig"].count(orig_name)
-            total += count_in_orig
-
-            # Search annotation-extracted translations
-            for anno_orig, trans_set in pc["anno_pairs"].items():
-                if _anno_name_matches(anno_orig, orig_name):
-                    for tname in trans_set:
-                        if _is_valid_translation(tname):
-                            all_translations[tname] = all_translations.get(tname, 0) + 1
-
-            # Search AI-suggested translations in cleaned text
-            for trans_candidate in ai_trans_list:
-                if trans_candidate and trans_candidate in pc["clean"]:
-                    cnt = pc["clean"].count(trans_candidate)
-                    all_translations[trans_candidate] = (
-                        all_translations.get(trans_candidate, 0) + cnt)
-
-            # Check if original name retained in translation
-            if orig_name in pc["clean"]:
-                cnt = pc["clean"].count(orig_name)
-                all_translations[orig_name] = (
-                    all_translations.get(orig_name, 0) + cnt)
-
-        if total > 1:
-            name_map[orig_name] = {"total": total, "translations": all_translations}
+    # ── Phase 3: one streaming pass updating every name per chapter ──
+    # CPU-bound; run it off the event loop so other requests and running
+    # translations are not stalled for the duration of the scan.
+    name_map = await asyncio.to_thread(
+        _search_names, project_id, verified_names, n_chapters)
 
     db.update_project(project_id, name_map=json.dumps(name_map, ensure_ascii=False))
     log.info("Rescanned names for project %s: %d names found", project_id, len(name_map))
@@ -1316,7 +1714,18 @@ async def rescan_all_names(project_id: str) -> dict:
     return name_map
 
 
-def combine_all_chapters(
+def _stored_json_list(raw: str | None) -> list:
+    """Decode a JSON list column (annotations, highlights); [] if empty or invalid."""
+    if not raw or raw == "[]":
+        return []
+    try:
+        parsed = json.loads(raw)
+    except (json.JSONDecodeError, TypeError):
+        return []
+    return parsed if isinstance(parsed, list) else []
+
+
+async def combine_all_chapters(
     project_id: str,
     include_annotations: bool = False,
     ann_placement: str = "end",
@@ -1324,8 +1733,10 @@ def combine_all_chapters(
     include_qa: bool = False,
 ) -> Path | None:
     """Combine all translated chapters into a single EPUB with optional appendices."""
-    project = db.get_project(project_id)
-    chapters = db.get_chapters(project_id)
+    project, chapters = db.get_project_with_chapters(project_id, fields=(
+        "id", "chapter_index", "title", "translated_title", "translated_content",
+        "annotations", "highlights", "epub_file_name",
+    ))
 
     if not project or not project.get("original_epub_path"):
         return None
@@ -1342,40 +1753,21 @@ def combine_all_chapters(
         bilingual_titles[fname] = _bilingual_title(ch["title"], tt)
         if ch.get("translated_content"):
             content = ch["translated_content"]
+            anns = _stored_json_list(ch.get("annotations")) if include_annotations else []
             # Inline annotations after each chapter
-            if include_annotations and ann_placement == "chapter":
-                raw_ann = ch.get("annotations") or ""
-                if raw_ann:
-                    try:
-                        anns = json.loads(raw_ann)
-                        if isinstance(anns, list) and anns:
-                            ann_html = _format_annotations_inline(anns)
-                            content += ann_html
-                    except (json.JSONDecodeError, TypeError):
-                        pass
+            if anns and ann_placement == "chapter":
+                content += _format_annotations_inline(anns)
             # Inline highlights after each chapter
             if include_highlights:
-                raw_hl = ch.get("highlights") or ""
-                if raw_hl:
-                    try:
-                        hls = json.loads(raw_hl)
-                        if isinstance(hls, list) and hls:
-                            content += _format_highlights_inline(hls)
-                    except (json.JSONDecodeError, TypeError):
-                        pass
+                hls = _stored_json_list(ch.get("highlights"))
+                if hls:
+                    content += _format_highlights_inline(hls)
             translations[fname] = content
 
             # Collect for end-of-book appendix
-            if include_annotations and ann_placement == "end":
-                raw_ann = ch.get("annotations") or ""
-                if raw_ann:
-                    try:
-                        anns = json.loads(raw_ann)
-                        if isinstance(anns, list) and anns:
-                            title = ch.get("translated_title") or ch.get("title", "")
-                            per_chapter_annotations[title] = anns
-                    except (json.JSONDecodeError, TypeError):
-                        pass
+            if anns and ann_placement == "end":
+                title = ch.get("translated_title") or ch.get("title", "")
+                per_chapter_annotations[title] = anns
 
     if not translations:
         return None
@@ -1391,11 +1783,14 @@ def combine_all_chapters(
             appendix_parts.append(_format_qa_appendix(qa_all, ch_map))
 
     out_dir = _get_output_dir(project)
-    safe_name = re.sub(r'[<>:"/\\|?*]', '_', project["name"])[:80].strip()
+    safe_name = _safe_project_name(project["name"])
     out_path = out_dir / f"{safe_name}_complete.epub"
-    build_translated_epub(project["original_epub_path"], translations, out_path,
-                          bilingual_titles=bilingual_titles,
-                          appendix_html="\n".join(appendix_parts) if appendix_parts else "")
+    # Reading, rewriting and re-zipping the whole book takes seconds on a
+    # long novel; keep it off the event loop.
+    await asyncio.to_thread(
+        build_translated_epub, project["original_epub_path"], translations, out_path,
+        bilingual_titles=bilingual_titles,
+        appendix_html="\n".join(appendix_parts) if appendix_parts else "")
     db.update_project(project_id, translated_epub_path=str(out_path))
     log.info("Combined EPUB: %s", out_path)
     return out_path
@@ -1403,57 +1798,53 @@ def combine_all_chapters(
 
 def _format_annotations_inline(anns: list) -> str:
     """Format annotations as HTML to append after a chapter's translation."""
-    html = '\n<hr style="margin:2em 0 1em"/>\n<h3>Translator\'s Notes / 翻译附注</h3>\n<ol>\n'
-    for a in anns:
-        src = a.get("src", "")
-        tgt = a.get("tgt", "")
-        note = a.get("note", "")
-        html += f'<li><em>{_esc_html(src)}</em>'
-        if tgt:
-            html += f' → {_esc_html(tgt)}'
-        if note:
-            html += f'<br/>{_esc_html(note)}'
-        html += '</li>\n'
-    html += '</ol>\n'
-    return html
+    parts = ['\n<hr style="margin:2em 0 1em"/>\n<h3>Translator\'s Notes / 翻译附注</h3>\n<ol>\n']
+    _append_annotation_items(parts, anns)
+    parts.append('</ol>\n')
+    return "".join(parts)
 
 
 def _format_highlights_inline(hls: list) -> str:
     """Format highlights as HTML to append after a chapter's translation."""
-    html = '\n<hr style="margin:2em 0 1em"/>\n<h3>Highlights & Notes / 划线笔记</h3>\n<ol>\n'
+    parts = ['\n<hr style="margin:2em 0 1em"/>\n<h3>Highlights & Notes / 划线笔记</h3>\n<ol>\n']
     for h in hls:
         text = h.get("text", "")
         note = h.get("note", "")
-        html += f'<li>"{_esc_html(text)}"'
+        parts.append(f'<li>"{_esc_html(text)}"')
         if note:
-            html += f'<br/><em>{_esc_html(note)}</em>'
-        html += '</li>\n'
-    html += '</ol>\n'
-    return html
+            parts.append(f'<br/><em>{_esc_html(note)}</em>')
+        parts.append('</li>\n')
+    parts.append('</ol>\n')
+    return "".join(parts)
+
+
+def _append_annotation_items(parts: list[str], anns: list) -> None:
+    """Append one <li> per annotation to *parts*."""
+    for a in anns:
+        src = a.get("src", "")
+        tgt = a.get("tgt", "")
+        note = a.get("note", "")
+        parts.append(f'<li><em>{_esc_html(src)}</em>')
+        if tgt:
+            parts.append(f' → {_esc_html(tgt)}')
+        if note:
+            parts.append(f'<br/>{_esc_html(note)}')
+        parts.append('</li>\n')
 
 
 def _format_annotations_appendix(per_chapter: dict[str, list]) -> str:
     """Format all annotations as a book-end appendix."""
-    html = '<h2>Translator\'s Notes / 翻译附注</h2>\n'
+    parts = ['<h2>Translator\'s Notes / 翻译附注</h2>\n']
     for title, anns in per_chapter.items():
-        html += f'<h3>{_esc_html(title)}</h3>\n<ol>\n'
-        for a in anns:
-            src = a.get("src", "")
-            tgt = a.get("tgt", "")
-            note = a.get("note", "")
-            html += f'<li><em>{_esc_html(src)}</em>'
-            if tgt:
-                html += f' → {_esc_html(tgt)}'
-            if note:
-                html += f'<br/>{_esc_html(note)}'
-            html += '</li>\n'
-        html += '</ol>\n'
-    return html
+        parts.append(f'<h3>{_esc_html(title)}</h3>\n<ol>\n')
+        _append_annotation_items(parts, anns)
+        parts.append('</ol>\n')
+    return "".join(parts)
 
 
 def _format_qa_appendix(qa_all: list, ch_map: dict) -> str:
     """Format all Q&A as a book-end appendix."""
-    html = '<h2>Q&A / 问答记录</h2>\n'
+    parts = ['<h2>Q&A / 问答记录</h2>\n']
     by_ch: dict[str, list] = {}
     for qa in qa_all:
         cid = qa.get("chapter_id", "general")
@@ -1461,13 +1852,13 @@ def _format_qa_appendix(qa_all: list, ch_map: dict) -> str:
     for cid, qas in by_ch.items():
         ch = ch_map.get(cid)
         title = (ch.get("translated_title") or ch.get("title", "")) if ch else "General"
-        html += f'<h3>{_esc_html(title)}</h3>\n'
+        parts.append(f'<h3>{_esc_html(title)}</h3>\n')
         for qa in qas:
             q = qa.get("question", "")
             a = qa.get("answer", "")
-            html += f'<p><strong>Q:</strong> {_esc_html(q)}</p>\n'
-            html += f'<p><strong>A:</strong> {_esc_html(a)}</p>\n<hr/>\n'
-    return html
+            parts.append(f'<p><strong>Q:</strong> {_esc_html(q)}</p>\n')
+            parts.append(f'<p><strong>A:</strong> {_esc_html(a)}</p>\n<hr/>\n')
+    return "".join(parts)
 
 
 def _esc_html(s: str) -> str:
@@ -1478,20 +1869,14 @@ def build_annotations_book(project_id: str) -> Path | None:
     """Build an EPUB containing all translator's annotations."""
     from .epub_service import build_annotations_epub
 
-    project = db.get_project(project_id)
-    chapters = db.get_chapters(project_id)
+    project, chapters = db.get_project_with_chapters(
+        project_id, fields=("chapter_index", "title", "translated_title", "annotations"))
     if not project or not chapters:
         return None
 
     chapters_data = []
     for ch in chapters:
-        raw_ann = ch.get("annotations") or ""
-        if not raw_ann:
-            continue
-        try:
-            annotations = json.loads(raw_ann)
-        except (json.JSONDecodeError, TypeError):
-            continue
+        annotations = _stored_json_list(ch.get("annotations"))
         if not annotations:
             continue
         title = ch.get("translated_title") or ch.get("title", f"Chapter {ch['chapter_index'] + 1}")
@@ -1501,26 +1886,23 @@ def build_annotations_book(project_id: str) -> Path | None:
         return None
 
     out_dir = _get_output_dir(project)
-    safe_name = re.sub(r'[<>:"/\\|?*]', '_', project["name"])[:80].strip()
+    safe_name = _safe_project_name(project["name"])
     out_path = out_dir / f"{safe_name}_annotations.epub"
     return build_annotations_epub(chapters_data, out_path, book_title=project["name"])
 
 
+# Chapter columns the highlights exports read; the chapter text is not needed.
+_HIGHLIGHT_FIELDS = ("chapter_index", "title", "translated_title", "highlights")
+
+
 def _collect_highlights(project_id: str) -> tuple[dict | None, list[dict], list[tuple[str, list]]]:
     """Return (project, chapters, [(title, highlights_list), ...])."""
-    project = db.get_project(project_id)
-    chapters = db.get_chapters(project_id)
+    project, chapters = db.get_project_with_chapters(project_id, fields=_HIGHLIGHT_FIELDS)
     if not project or not chapters:
         return None, [], []
     result = []
     for ch in chapters:
-        raw = ch.get("highlights") or ""
-        if not raw:
-            continue
-        try:
-            highlights = json.loads(raw)
-        except (json.JSONDecodeError, TypeError):
-            continue
+        highlights = _stored_json_list(ch.get("highlights"))
         if not highlights:
             continue
         title = ch.get("translated_title") or ch.get("title", f"Chapter {ch['chapter_index'] + 1}")
@@ -1534,21 +1916,26 @@ def build_highlights_markdown(project_id: str) -> Path | None:
     if not project or not hl_data:
         return None
 
-    lines = [f"# {project['name']} — Highlights & Notes\n"]
-    for title, highlights in hl_data:
-        lines.append(f"\n## {title}\n")
-        for i, h in enumerate(highlights, 1):
-            text = h.get("text", "")
-            note = h.get("note", "")
-            lines.append(f"**{i}.** > {text}")
-            if note:
-                lines.append(f"   *{note}*")
-            lines.append("")
+    def _lines():
+        for title, highlights in hl_data:
+            yield f"\n## {title}\n"
+            for i, h in enumerate(highlights, 1):
+                text = h.get("text", "")
+                note = h.get("note", "")
+                yield f"**{i}.** > {text}"
+                if note:
+                    yield f"   *{note}*"
+                yield ""
 
     out_dir = _get_output_dir(project)
-    safe_name = re.sub(r'[<>:"/\\|?*]', '_', project["name"])[:80].strip()
+    safe_name = _safe_project_name(project["name"])
     out_path = out_dir / f"{safe_name}_highlights.md"
-    out_path.write_text("\n".join(lines), encoding="utf-8")
+    # Written line by line rather than joined into one string first
+    with out_path.open("w", encoding="utf-8") as f:
+        f.write(f"# {project['name']} — Highlights & Notes\n")
+        for line in _lines():
+            f.write("\n")
+            f.write(line)
     log.info("Built highlights Markdown: %s", out_path)
     return out_path
 
@@ -1557,20 +1944,13 @@ def build_highlights_book(project_id: str) -> Path | None:
     """Build an EPUB containing all user highlights and notes."""
     from .epub_service import build_annotations_epub
 
-    project = db.get_project(project_id)
-    chapters = db.get_chapters(project_id)
+    project, chapters = db.get_project_with_chapters(project_id, fields=_HIGHLIGHT_FIELDS)
     if not project or not chapters:
         return None
 
     chapters_data = []
     for ch in chapters:
-        raw = ch.get("highlights") or ""
-        if not raw:
-            continue
-        try:
-            highlights = json.loads(raw)
-        except (json.JSONDecodeError, TypeError):
-            continue
+        highlights = _stored_json_list(ch.get("highlights"))
         if not highlights:
             continue
         title = ch.get("translated_title") or ch.get("title", f"Chapter {ch['chapter_index'] + 1}")
@@ -1587,7 +1967,7 @@ def build_highlights_book(project_id: str) -> Path | None:
         return None
 
     out_dir = _get_output_dir(project)
-    safe_name = re.sub(r'[<>:"/\\|?*]', '_', project["name"])[:80].strip()
+    safe_name = _safe_project_name(project["name"])
     out_path = out_dir / f"{safe_name}_highlights.epub"
     return build_annotations_epub(chapters_data, out_path, book_title=f"{project['name']} Highlights & Notes")
 
@@ -1596,8 +1976,8 @@ def build_qa_book(project_id: str) -> Path | None:
     """Build an EPUB containing all Q&A conversations."""
     from .epub_service import build_annotations_epub
 
-    project = db.get_project(project_id)
-    chapters = db.get_chapters(project_id)
+    project, chapters = db.get_project_with_chapters(
+        project_id, fields=("id", "title", "translated_title"))
     qa_all = db.get_qa_history(project_id)
     if not project or not qa_all:
         return None
@@ -1625,35 +2005,63 @@ def build_qa_book(project_id: str) -> Path | None:
         return None
 
     out_dir = _get_output_dir(project)
-    safe_name = re.sub(r'[<>:"/\\|?*]', '_', project["name"])[:80].strip()
+    safe_name = _safe_project_name(project["name"])
     out_path = out_dir / f"{safe_name}_qa.epub"
     return build_annotations_epub(chapters_data, out_path, book_title=f"{project['name']} Q&A")
 
 
 def get_chapter_files(project_id: str) -> list[dict]:
     """List per-chapter EPUB files that exist on disk."""
-    project = db.get_project(project_id)
-    chapters = db.get_chapters(project_id)
+    project, chapters = db.get_project_with_chapters(
+        project_id, fields=("id", "chapter_index", "title", "status"))
     if not project:
         return []
 
+    # One directory listing instead of a stat per chapter; listing never
+    # needs to create the directory.
+    out_dir = _output_dir(project)
+    try:
+        with os.scandir(out_dir) as it:
+            present = {e.name for e in it}
+    except FileNotFoundError:
+        present = set()
+
     files = []
     for ch in chapters:
-        path = _chapter_epub_path(project, ch)
+        file_name = _chapter_epub_name(ch)
         files.append({
             "chapter_id": ch["id"],
             "chapter_index": ch["chapter_index"],
             "title": ch["title"],
             "status": ch["status"],
-            "file_exists": path.exists(),
-            "file_name": path.name,
+            "file_exists": file_name in present,
+            "file_name": file_name,
         })
     return files
 
 
+# Summary input budget in UTF-8 bytes rather than characters: a CJK
+# character costs ~3 bytes and 1-2 tokens, so a character limit let CJK
+# chapters send several times more tokens than Latin-script ones.
+_SUMMARY_MAX_BYTES = 15000
+
+
+def _truncate_utf8(text: str, max_bytes: int) -> str:
+    """Cut text to at most max_bytes of UTF-8, preferably at a paragraph break."""
+    if len(text) * 4 <= max_bytes:
+        return text
+    data = text.encode("utf-8")
+    if len(data) <= max_bytes:
+        return text
+    head = data[:max_bytes].decode("utf-8", errors="ignore")
+    cut = head.rfind("\n\n")
+    if cut > len(head) // 2:
+        head = head[:cut]
+    return head + "\n[...]"
+
+
 async def _summarize(title: str, text: str) -> str:
-    if len(text) > 15000:
-        text = text[:15000] + "\n[...]"
+    text = _truncate_utf8(text, _SUMMARY_MAX_BYTES)
     return await llm_service.chat(
         system_prompt="Produce a concise 2-3 sentence summary of this chapter. Return only the summary.",
         user_prompt=f"Chapter: {title}\n\n{text}",
@@ -1661,6 +2069,9 @@ async def _summarize(title: str, text: str) -> str:
     )
 
 
+_SENT_SPLIT_RE = re.compile(r'(?<=[.!?。！？])\s+')
+
+
 def _split_text(text: str, max_chars: int) -> list[str]:
     """Split text at paragraph boundaries, keeping scene/dialogue together where possible."""
     paragraphs = text.split("\n\n")
@@ -1673,13 +2084,10 @@ def _split_text(text: str, max_chars: int) -> list[str]:
             chunks.append("\n\n".join(current))
             current = []
             current_len = 0
-        # If a single paragraph exceeds max_chars, split it by sentences
+        # If a single paragraph exceeds max_chars, split it by sentences.
+        # The flush above has already emitted any pending paragraphs.
         if len(para) > max_chars:
-            if current:
-                chunks.append("\n\n".join(current))
-                current = []
-                current_len = 0
-            sentences = re.split(r'(?<=[.!?。！？])\s+', para)
+            sentences = _SENT_SPLIT_RE.split(para)
             sent_buf: list[str] = []
             sent_len = 0
             for sent in sentences: